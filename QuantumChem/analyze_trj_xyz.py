@@ -2,126 +2,812 @@
 # -*- coding: utf-8 -*-
 
 #! IMPORTS
-from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from itertools import islice
+import argparse
+import csv
+import glob
+import mmap
+import operator
+import os
+import sys
+import zipfile
 import numpy as np
-import regex  # better than re module
-from sys import argv, exit
+
+from trj_comments import CommentFormat, get_format, parse_energies, parse_energy
+from trj_comments import HARTREE_TO_KCAL, sniff_file, sniff_format
+from trj_descriptors import evaluate, parse_cv
+from mol_io import Molecule, format_xyz, write
+from orca_out_parser import available_cpus
 
 #! CONSTANTS
-MAX_GEOM = 2000
-IS_XTB = False  # default value
-IS_ORCA = False  # default value
-IS_PLOT = False  # default value
-
-
-def read_blocks_trj_xyz(
-    _lines: [str], idx_geom: int
-) -> [str]:  # TODO: geom_matr as return type
-    """Reads a .trj.xyz file and returns the energies and geometries of a given file."""
-    # _elem_list = []
-    _geom_matr = np.zeros((NO_ATOMS, 3), dtype=np.float32)
-    for line_idx, line in enumerate(_lines[1:]):
-        if line_idx == 0:
-            if IS_XTB:
-                E_array[idx_geom] = read_energy_xtb(line)
-            else:
-                E_array[idx_geom] = read_energy_orca(line)
-        else:
-            line_split = line.strip().split()
-            __geom_line = np.array([float(x) for x in line_split[1:]])
-            # elem_sym_regex = (
-            #     r"([A-Z][a-z]?)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)\s+(-?\d+\.\d+)"
-            # )
-            # elem_sym_regex_pattern = regex.compile(elem_sym_regex)
-            # match = elem_sym_regex_pattern.search(line)
-            # if match:
-                # _elem_list.append(match.group(1))
-                # _geom_matr[line_idx - 1] = np.array(
-                #     [
-                #         float(match.group(2)),
-                #         float(match.group(3)),
-                #         float(match.group(4)),
-                #     ]
-                # )
-    # return _elem_list, _geom_matr
-    return _geom_matr
-
-def read_energy_xtb(_line: str) -> Optional[float]:
-    """Reads the energy from a .trj.xyz file generated by xtb."""
-    xtb_E_pattern = r"energy:\s*(-?\d+\.\d+)"
-    regex_pattern = regex.compile(xtb_E_pattern)
-    match = regex_pattern.search(_line)
-    if match:
-        return float(match.group(1))
-    return 0.0  # * ERROR case (not very good handling)
-
-def read_energy_orca(_line: str) -> Optional[float]:
-    """Reads the energy from a .trj.xyz file generated by ORCA."""
-    orca_E_pattern = r"^\w+ \w+ [a-zA-Z-]+ [a-zA-Z0-9_\-*]+ E (-?\d+\.\d+)"
-    regex_pattern = regex.compile(orca_E_pattern)
-    match = regex_pattern.search(_line)
-    if match:
-        return float(match.group(1))
-    return None
+INDEX_SUFFIX = ".idx.npz"  # * sidecar with the byte offsets of all frames
+CACHE_SUFFIX = ".cache.npz"  # * binary copy: coordinates, energies, comments
+CACHE_VERSION = 2  # * 2: float64 coordinates (same results as the text file)
+INDEX_CHUNK = 1 << 26  # * bytes searched for newlines at once (64 MiB)
+CHUNK_FRAMES = 1000  # * frames per chunk of iter_trj_chunks
 
 
-if __name__ == "__main__":
-    #! FOR TESTING
-    # file_path = "sources/Test.trj.xyz"
-    # IS_XTB = True
-
-    args = argv
-
-    if len(args) == 1:
-        exit("ERROR: No file path given")
-    elif len(args) == 2:
-        exit("ERROR: ADD XTB/ ORCA FLAG with -xtb or -orca")
-    elif len(args) >= 3:
-        file_path = args[1]
-        for arg in args[2:]:
-            if "-xtb" in arg:
-                IS_XTB = True
-                print("XTB FLAG DETECTED")
-            elif "-orca" in arg:
-                IS_ORCA = True
-                print("ORCA FLAG DETECTED")
-            elif "-print" in arg:
-                IS_PLOT = True
-                print("PRINT FLAG DETECTED")
-                import matplotlib.pyplot as plt
-
-    print("Reading file: " + file_path)
+def _resolve_format(comment_format: Optional[str], first_comment: str) -> CommentFormat:
+    """Registered format by name, or sniffed from the first comment line."""
+    if comment_format is not None:
+        return get_format(comment_format)
+    return sniff_format(first_comment)
+
+
+def _drop_incomplete_frame(lines: List[str], no_atoms: int, file_path: str) -> None:
+    """
+    Removes an unfinished last frame (running MD/CREST job) from the end of the
+    lines, like build_frame_index() does, and warns about it.
+    """
+    incomplete = len(lines) % (no_atoms + 2)
+    if incomplete:
+        del lines[-incomplete:]
+        print(
+            f"WARNING: {file_path}: incomplete last frame ({incomplete} lines) "
+            "ignored"
+        )
+
+
+def _parse_blocks(
+    lines: List[str], no_atoms: int, fmt: CommentFormat
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Parses complete xyz blocks (count line, comment, no_atoms atom lines) in
+    bulk. Returns the geometries (n_frames, n_atoms, 3), the energies and the
+    comment lines. The list is emptied on the way (header lines are deleted in
+    place).
+    """
+    block_len = no_atoms + 2
+    if len(lines) % block_len != 0:
+        raise ValueError(
+            f"{len(lines)} lines are not a multiple of {block_len} "
+            f"({no_atoms} atoms + 2 lines per geometry)"
+        )
+    if any(line.strip() != str(no_atoms) for line in lines[::block_len]):
+        raise ValueError("Not all geometries have the same number of atoms")
+
+    comments = [comment.rstrip("\r\n") for comment in lines[1::block_len]]
+    energies, _ = parse_energies(comments, fmt)
+
+    #! drop the two header lines of every block (C level, no copy per frame),
+    #! then all coordinates are parsed by one np.loadtxt call
+    del lines[1::block_len]
+    del lines[:: block_len - 1]
+    geometries = np.loadtxt(lines, usecols=(1, 2, 3), ndmin=2)
+    lines.clear()
+    return geometries.reshape(-1, no_atoms, 3), energies, comments
+
+
+def read_trj_xyz(
+    file_path: str, comment_format: Optional[str] = None
+) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """
+    Reads a whole .trj.xyz file in bulk.
+    Returns the element symbols, the geometries as (n_frames, n_atoms, 3) array
+    and the energies (n_frames, NaN if not readable). The comment format
+    (see trj_comments.py) is sniffed from the first frame unless given.
+    """
     with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-        if len(lines) > 0 and lines[0].strip().isdigit():
-            NO_ATOMS = int(lines[0])
+        lines = f.read().splitlines()
+    while lines and not lines[-1].strip():  # * trailing empty lines
+        lines.pop()
+    if not lines or not lines[0].strip().isdigit():
+        raise ValueError("No_atoms not digit format (check first line)")
+    no_atoms = int(lines[0])
+    elements = [line.split()[0] for line in lines[2 : no_atoms + 2]]
+    fmt = _resolve_format(comment_format, lines[1] if len(lines) > 1 else "")
+    _drop_incomplete_frame(lines, no_atoms, file_path)
+    geometries, energies, _ = _parse_blocks(lines, no_atoms, fmt)
+    return elements, geometries, energies
+
+
+def iter_trj_chunks(
+    file_path: str, chunk_size: int = CHUNK_FRAMES, comment_format: Optional[str] = None
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Streams a .trj.xyz file in chunks of chunk_size frames.
+    Yields (geometries (<= chunk_size, n_atoms, 3), energies) per chunk, so the
+    memory needed does not grow with the length of the trajectory.
+    """
+    for geometries, energies, _ in _iter_blocks(file_path, chunk_size, comment_format):
+        yield geometries, energies
+
+
+def _iter_blocks(
+    file_path: str, chunk_size: int, comment_format: Optional[str]
+) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str]]]:
+    """iter_trj_chunks, plus the comment lines of every chunk."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        first_line = f.readline()
+        if not first_line.strip().isdigit():
+            raise ValueError("No_atoms not digit format (check first line)")
+        no_atoms = int(first_line)
+        chunk_lines = chunk_size * (no_atoms + 2)
+        lines = [first_line]
+        fmt = None
+        while True:
+            lines.extend(islice(f, chunk_lines - len(lines)))
+            if fmt is None:  # * sniffed once, from the first frame
+                fmt = _resolve_format(
+                    comment_format, lines[1] if len(lines) > 1 else ""
+                )
+            if len(lines) < chunk_lines:  # * end of file
+                while lines and not lines[-1].strip():
+                    lines.pop()
+                _drop_incomplete_frame(lines, no_atoms, file_path)
+                if lines:
+                    yield _parse_blocks(lines, no_atoms, fmt)
+                return
+            yield _parse_blocks(lines, no_atoms, fmt)
+
+
+def build_frame_index(file_path: str) -> Tuple[int, np.ndarray]:
+    """
+    Scans a memory map of a .trj.xyz file for the start of every frame.
+    Returns the number of atoms and the byte offsets of all frames plus the end
+    of the last complete frame (n_frames + 1 values).
+    """
+    with open(file_path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise ValueError("Empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            first_newline = mm.find(b"\n")
+            first_line = mm[: first_newline if first_newline != -1 else size]
+            if not first_line.strip().isdigit():
+                raise ValueError("No_atoms not digit format (check first line)")
+            no_atoms = int(first_line)
+            block_len = no_atoms + 2
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            starts = [np.zeros(1, dtype=np.int64)]
+            no_lines = 0  # * newlines before the current chunk
+            for chunk_start in range(0, size, INDEX_CHUNK):
+                newlines = np.flatnonzero(
+                    buf[chunk_start : chunk_start + INDEX_CHUNK] == 10
+                )
+                #! line no_lines + k + 1 starts after the k-th newline of the chunk
+                line_no = no_lines + 1 + np.arange(len(newlines))
+                starts.append(newlines[line_no % block_len == 0] + chunk_start + 1)
+                no_lines += len(newlines)
+            del buf  # * the mmap cannot be closed while numpy still uses it
+            if mm[size - 1 : size] != b"\n":  # * last line without newline
+                no_lines += 1
+    frame_starts = np.concatenate(starts)
+    no_frames = no_lines // block_len  # * an unfinished last frame is ignored
+    if no_frames < len(frame_starts):
+        end = frame_starts[no_frames]
+    else:
+        end = size
+    return no_atoms, np.append(frame_starts[:no_frames], end)
+
+
+def load_frame_index(file_path: str) -> Tuple[int, np.ndarray]:
+    """
+    Frame index from the sidecar file (<file>.idx.npz) if it belongs to the
+    current version of the trajectory, otherwise it is built and saved.
+    """
+    stat = os.stat(file_path)
+    sidecar = file_path + INDEX_SUFFIX
+    try:
+        with np.load(sidecar) as index:
+            if (
+                int(index["size"]) == stat.st_size
+                and int(index["mtime_ns"]) == stat.st_mtime_ns
+            ):
+                return int(index["no_atoms"]), index["offsets"]
+    except (OSError, KeyError, ValueError):
+        pass
+    no_atoms, offsets = build_frame_index(file_path)
+    try:
+        with open(sidecar, "wb") as f:
+            np.savez(
+                f,
+                no_atoms=no_atoms,
+                offsets=offsets,
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+    except OSError:  # * read-only directory: index is just not kept
+        pass
+    return no_atoms, offsets
+
+
+def cache_path(file_path: str) -> str:
+    """Binary cache file of a trajectory (<file>.cache.npz)."""
+    if file_path.endswith(CACHE_SUFFIX):
+        return file_path
+    return file_path + CACHE_SUFFIX
+
+
+def load_trj_cache(
+    file_path: str, comment_format: Optional[str] = None
+) -> Optional[str]:
+    """
+    Path of the binary cache of a trajectory if it belongs to the current
+    version of the file (size, mtime, comment format) and was written by the
+    current CACHE_VERSION, otherwise None.
+    """
+    try:
+        stat = os.stat(file_path)
+        if comment_format is None:
+            comment_format = sniff_file(file_path).name
+        with np.load(cache_path(file_path)) as cache:
+            if (
+                int(cache["version"]) == CACHE_VERSION
+                and int(cache["size"]) == stat.st_size
+                and int(cache["mtime_ns"]) == stat.st_mtime_ns
+                and str(cache["comment_format"]) == comment_format
+            ):
+                return cache_path(file_path)
+    except (OSError, KeyError, ValueError):
+        pass
+    return None
+
+
+def _save_member(archive: zipfile.ZipFile, name: str, array: np.ndarray) -> None:
+    with archive.open(name + ".npy", "w", force_zip64=True) as fp:
+        np.lib.format.write_array(fp, np.asarray(array), allow_pickle=False)
+
+
+def _write_trj_cache(
+    file_path: str, chunk_size: int, comment_format: Optional[str], compress: bool
+) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str]]]:
+    """
+    Streams the text file like _iter_blocks and writes the cache on the way:
+    the coordinates go straight into the archive chunk by chunk (float64), so
+    memory use stays bounded. The cache only appears once it is complete.
+    """
+    stat = os.stat(file_path)
+    if comment_format is None:
+        comment_format = sniff_file(file_path).name
+    no_atoms, offsets = load_frame_index(file_path)
+    no_frames = len(offsets) - 1
+    final_path = cache_path(file_path)
+    tmp_path = final_path + ".tmp"
+    energies: List[np.ndarray] = []
+    comments: List[str] = []
+    elements = None
+    written = 0
+    try:
+        archive = zipfile.ZipFile(
+            tmp_path, "w", zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        )
+    except OSError:  # * read-only directory: no cache, just stream the text
+        yield from _iter_blocks(file_path, chunk_size, comment_format)
+        return
+    try:
+        with archive:
+            with archive.open("geometries.npy", "w", force_zip64=True) as fp:
+                header = {
+                    "descr": np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                    "fortran_order": False,
+                    "shape": (no_frames, no_atoms, 3),
+                }
+                np.lib.format.write_array_header_1_0(fp, header)
+                for geometries, energy_chunk, comment_chunk in _iter_blocks(
+                    file_path, chunk_size, comment_format
+                ):
+                    fp.write(geometries.astype(np.float64).tobytes())
+                    energies.append(energy_chunk)
+                    comments.extend(comment_chunk)
+                    written += len(geometries)
+                    yield geometries, energy_chunk, comment_chunk
+            if written != no_frames:
+                raise ValueError(f"{written} frames read, {no_frames} indexed")
+            elements = []
+            if no_frames:  # * truncated file: no complete frame to read them from
+                with open(file_path, "r", encoding="utf-8") as f:
+                    f.readline()
+                    f.readline()
+                    elements = [f.readline().split()[0] for _ in range(no_atoms)]
+            _save_member(archive, "elements", np.array(elements, dtype=str))
+            _save_member(
+                archive,
+                "energies",
+                np.concatenate(energies) if energies else np.empty(0),
+            )
+            _save_member(archive, "comments", np.array(comments, dtype=str))
+            _save_member(archive, "version", np.array(CACHE_VERSION))
+            _save_member(archive, "size", np.array(stat.st_size))
+            _save_member(archive, "mtime_ns", np.array(stat.st_mtime_ns))
+            _save_member(archive, "comment_format", np.array(comment_format))
+        os.replace(tmp_path, final_path)
+    finally:
+        if os.path.exists(tmp_path):  # * aborted or failed: no half-written cache
+            os.remove(tmp_path)
+
+
+def _read_trj_cache(
+    path: str, chunk_size: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str]]]:
+    """Chunks of a binary cache (coordinates are read chunk by chunk)."""
+    with np.load(path) as cache:
+        energies = cache["energies"]
+        comments = cache["comments"].tolist()
+    with zipfile.ZipFile(path) as archive, archive.open("geometries.npy") as fp:
+        np.lib.format.read_magic(fp)
+        shape, _, dtype = np.lib.format.read_array_header_1_0(fp)
+        frame_bytes = shape[1] * 3 * dtype.itemsize
+        for start in range(0, shape[0], chunk_size):
+            stop = min(start + chunk_size, shape[0])
+            data = fp.read((stop - start) * frame_bytes)
+            geometries = np.frombuffer(data, dtype=dtype).reshape(-1, shape[1], 3)
+            yield geometries, energies[start:stop], comments[start:stop]
+
+
+def cached_trj_chunks(
+    file_path: str,
+    chunk_size: int = CHUNK_FRAMES,
+    comment_format: Optional[str] = None,
+    compress: bool = False,
+) -> Iterator[Tuple[np.ndarray, np.ndarray, List[str]]]:
+    """
+    Like iter_trj_chunks (plus the comment lines), but the frames come from
+    the binary cache (<file>.cache.npz) if it is up to date. Otherwise the text
+    is parsed and the cache is written for the next run (compress = deflate).
+    """
+    path = load_trj_cache(file_path, comment_format)
+    if path is not None:
+        yield from _read_trj_cache(path, chunk_size)
+    else:
+        yield from _write_trj_cache(file_path, chunk_size, comment_format, compress)
+
+
+def trj_cache_to_xyz(path: str, out_path: str, chunk_size: int = CHUNK_FRAMES) -> int:
+    """
+    Writes a binary cache back to a plain multi-xyz file (original comment
+    lines, e.g. for ChemCraft or xtb_xyz_to_chemcraft.py). Returns the number
+    of frames.
+    """
+    with np.load(cache_path(path)) as cache:
+        elements = cache["elements"]
+        no_frames = len(cache["energies"])
+
+    def frames() -> Iterator[Molecule]:
+        for geometries, _, comments in _read_trj_cache(cache_path(path), chunk_size):
+            for geometry, comment in zip(geometries, comments):
+                yield Molecule(elements, geometry, comment)
+
+    write(out_path, frames(), fmt="multi-xyz")
+    return no_frames
+
+
+class Frame(NamedTuple):
+    """One geometry of a trajectory."""
+
+    elements: List[str]
+    coordinates: np.ndarray  # * (n_atoms, 3)
+    energy: float  # * NaN if not readable
+    comment: str
+
+
+class Trajectory:
+    """
+    Random access to a .trj.xyz file through a memory map and a frame index.
+
+    Only the frames that are asked for are decoded, so memory use does not
+    depend on the length of the trajectory:
+        traj = Trajectory("md.trj.xyz")
+        len(traj), traj[90000].coordinates, traj[-1].energy
+        every_10th = traj[::10]  # * lazy view, nothing decoded yet
+        every_10th.geometries(), every_10th.energies()
+    Views share the memory map of their parent and do not own it: closing a
+    view (or leaving a with block on it) does nothing, close the parent.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        comment_format: Optional[str] = None,
+        use_sidecar: bool = True,
+    ):
+        self.file_path = file_path
+        if comment_format is None:
+            self.comment_format = sniff_file(file_path)
+        else:
+            self.comment_format = get_format(comment_format)
+        if use_sidecar:
+            self.no_atoms, offsets = load_frame_index(file_path)
         else:
-            from sys import exit
+            self.no_atoms, offsets = build_frame_index(file_path)
+        self._starts = offsets[:-1]
+        self._ends = offsets[1:]
+        self._file = open(file_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._owns_map = True
 
-            print("INVALID FILE FORMAT: No_atoms not digit format (check first line)")
-            exit(1)
-    BLOCK_LEN = NO_ATOMS + 2
+    def _view(self, selection) -> "Trajectory":
+        view = object.__new__(Trajectory)
+        view.__dict__.update(self.__dict__)
+        view._starts = self._starts[selection]
+        view._ends = self._ends[selection]
+        view._owns_map = False
+        return view
 
-    geom_block_list = [
-        lines[i : i + BLOCK_LEN] for i in range(0, len(lines), BLOCK_LEN)
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, key):
+        if isinstance(key, (slice, list, np.ndarray)):
+            return self._view(key)
+        idx = operator.index(key)
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError(f"Frame {key} out of range ({len(self)} frames)")
+        return self._decode(idx)
+
+    def __iter__(self) -> Iterator[Frame]:
+        for idx in range(len(self)):
+            yield self._decode(idx)
+
+    def _decode(self, idx: int) -> Frame:
+        block = self._mm[self._starts[idx] : self._ends[idx]]
+        lines = block.decode("utf-8", errors="replace").splitlines()
+        if int(lines[0]) != self.no_atoms:
+            raise ValueError(f"Frame {idx} does not have {self.no_atoms} atoms")
+        atom_lines = [line.split() for line in lines[2 : self.no_atoms + 2]]
+        return Frame(
+            elements=[parts[0] for parts in atom_lines],
+            coordinates=np.array([parts[1:4] for parts in atom_lines], dtype=float),
+            energy=parse_energy(lines[1], self.comment_format),
+            comment=lines[1],
+        )
+
+    @property
+    def elements(self) -> List[str]:
+        return self._decode(0).elements
+
+    def geometries(self) -> np.ndarray:
+        """All selected frames as (n_frames, n_atoms, 3) array."""
+        geometries = np.empty((len(self), self.no_atoms, 3))
+        for idx, frame in enumerate(self):
+            geometries[idx] = frame.coordinates
+        return geometries
+
+    def energies(self) -> np.ndarray:
+        return np.array([frame.energy for frame in self], dtype=float)
+
+    def close(self) -> None:
+        if not self._owns_map:  # * view: the parent closes the map
+            return
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "Trajectory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TrjSummary(NamedTuple):
+    """Result of analyze_trajectory() for one file."""
+
+    file_path: str
+    comment_format: str
+    no_atoms: int
+    energies: np.ndarray  # * E_h, NaN for unreadable comment lines
+    cv: Optional[np.ndarray] = None  # * values of the -cv coordinate
+    error: str = ""  # * set instead of raising by analyze_trajectories()
+
+    @property
+    def no_frames(self) -> int:
+        return len(self.energies)
+
+    @property
+    def bad_frames(self) -> np.ndarray:
+        """Frames whose comment line has no energy (none for "plain")."""
+        if self.comment_format == "plain":
+            return np.zeros(0, dtype=int)
+        return np.flatnonzero(np.isnan(self.energies))
+
+    def _has_energies(self) -> bool:
+        return bool(np.isfinite(self.energies).any())
+
+    @property
+    def min_energy(self) -> float:
+        return float(np.nanmin(self.energies)) if self._has_energies() else np.nan
+
+    @property
+    def max_energy(self) -> float:
+        return float(np.nanmax(self.energies)) if self._has_energies() else np.nan
+
+    @property
+    def barrier(self) -> float:
+        """Highest energy relative to the first frame (kcal/mol)."""
+        if not self.no_frames:
+            return np.nan
+        return (self.max_energy - self.energies[0]) * HARTREE_TO_KCAL
+
+
+def analyze_trajectory(
+    file_path: str,
+    comment_format: Optional[str] = None,
+    cv_spec: Optional[str] = None,
+    use_cache: bool = True,
+    chunk_size: int = CHUNK_FRAMES,
+) -> TrjSummary:
+    """
+    Energies (and the values of the collective variable cv_spec) of all
+    frames of one trajectory. Reads chunk by chunk, from the binary cache if
+    use_cache is set. No global state, so it can run in worker processes.
+    """
+    fmt = get_format(comment_format) if comment_format else sniff_file(file_path)
+    if use_cache:
+        chunks = cached_trj_chunks(file_path, chunk_size, fmt.name)
+    else:
+        chunks = _iter_blocks(file_path, chunk_size, fmt.name)
+    no_atoms = 0
+    energy_chunks = [np.zeros(0)]
+    cv_chunks = [np.zeros(0)]
+    for geometries, energies, _ in chunks:
+        no_atoms = geometries.shape[1]
+        energy_chunks.append(energies)
+        if cv_spec is not None:
+            try:
+                cv_chunks.append(evaluate(geometries, cv_spec))
+            except IndexError:
+                raise ValueError(
+                    f"an atom number of {cv_spec} is larger than {no_atoms}"
+                ) from None
+    return TrjSummary(
+        file_path=file_path,
+        comment_format=fmt.name,
+        no_atoms=no_atoms,
+        energies=np.concatenate(energy_chunks),
+        cv=np.concatenate(cv_chunks) if cv_spec is not None else None,
+    )
+
+
+def _analyze_or_error(file_path: str, **options) -> TrjSummary:
+    try:
+        return analyze_trajectory(file_path, **options)
+    except (OSError, ValueError) as err:
+        return TrjSummary(file_path, "", 0, np.zeros(0), error=str(err))
+
+
+def analyze_trajectories(
+    file_paths: Sequence[str], jobs: int = 1, **options
+) -> Iterator[TrjSummary]:
+    """
+    analyze_trajectory() for many files, results in the order of file_paths.
+    jobs > 1 uses a process pool (jobs <= 0: all available cores). Files that
+    cannot be read give a TrjSummary with error set instead of an exception.
+    """
+    if jobs <= 0:
+        jobs = available_cpus()
+    jobs = min(jobs, len(file_paths))
+    worker = partial(_analyze_or_error, **options)
+    if jobs <= 1:
+        yield from map(worker, file_paths)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, file_paths)
+
+
+SUMMARY_COLUMNS = (
+    "file",
+    "format",
+    "frames",
+    "atoms",
+    "E_min/E_h",
+    "E_max/E_h",
+    "barrier/kcal/mol",
+    "bad_frames",
+    "error",
+)
+
+
+def summary_rows(results: Sequence[TrjSummary]) -> List[Tuple]:
+    """One row per trajectory, columns as in SUMMARY_COLUMNS."""
+    rows = []
+    for res in results:
+        if res.error:
+            rows.append((res.file_path, "", 0, 0, np.nan, np.nan, np.nan, 0, res.error))
+            continue
+        rows.append(
+            (
+                res.file_path,
+                res.comment_format,
+                res.no_frames,
+                res.no_atoms,
+                res.min_energy,
+                res.max_energy,
+                res.barrier,
+                len(res.bad_frames),
+                "",
+            )
+        )
+    return rows
+
+
+def summary_table(results: Sequence[TrjSummary]) -> str:
+    """Fixed width text table of summary_rows()."""
+    rows = summary_rows(results)
+    width = max([len("file")] + [len(row[0]) for row in rows])
+    lines = [
+        f"{'file':{width}} {'format':>7} {'frames':>7} {'atoms':>6} "
+        f"{'E_min / E_h':>16} {'E_max / E_h':>16} {'barrier / kcal/mol':>19} "
+        f"{'bad':>5}"
     ]
-    NO_GEOM = len(geom_block_list)
-    E_array = np.zeros(NO_GEOM)
+    for path, fmt, frames, atoms, e_min, e_max, barrier, bad, error in rows:
+        if error:
+            lines.append(f"{path:{width}} ERROR: {error}")
+            continue
+        lines.append(
+            f"{path:{width}} {fmt:>7} {frames:7d} {atoms:6d} {e_min:16.8f} "
+            f"{e_max:16.8f} {barrier:19.2f} {bad:5d}"
+        )
+    return "\n".join(lines)
+
+
+def write_summary_csv(results: Sequence[TrjSummary], out_path: str) -> None:
+    with open(out_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(SUMMARY_COLUMNS)
+        writer.writerows(summary_rows(results))
+
+
+def expand_paths(patterns: Sequence[str]) -> List[str]:
+    """File names and glob patterns (also quoted ones) -> unique file names."""
+    paths: List[str] = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        paths.extend(path for path in matches if path not in paths)
+    return paths
 
-    geom_matr_list = []
-    for idx_geom, block in enumerate(geom_block_list):
-        geom_matr_list.append((idx_geom, read_blocks_trj_xyz(block, idx_geom)))
 
-    print("Energies: ", E_array)
-    print("You can plot these energies by adding the -plot flag")
-    if IS_PLOT:
+def print_details(res: TrjSummary, cv_spec: Optional[str]) -> None:
+    """Single file output: all energies (and coordinate values)."""
+    print(f"Comment line format: {res.comment_format}")
+    print(f"{res.no_frames} geometries with {res.no_atoms} atoms read")
+    if res.comment_format == "plain":
+        print("WARNING: no energies in the comment lines")
+    elif len(res.bad_frames):
+        print(
+            f"WARNING: {len(res.bad_frames)} comment lines without "
+            f"{res.comment_format} energy "
+            f"(frames {', '.join(map(str, res.bad_frames[:10]))}"
+            f"{', ...' if len(res.bad_frames) > 10 else ''})"
+        )
+    print("Energies: ", res.energies)
+    print("You can plot these energies by adding the -print flag")
+    if cv_spec is not None:
+        print(f"Coordinate {cv_spec}: ", res.cv)
+        if np.isfinite(res.energies).any():
+            idx_min = np.nanargmin(res.energies)
+            print(
+                f"Lowest energy {res.energies[idx_min]} E_h at {cv_spec} = "
+                f"{res.cv[idx_min]}"
+            )
+
+
+def plot_energies(results: Sequence[TrjSummary], cv_spec: Optional[str]) -> None:
+    """Energy vs frame (or vs coordinate) of all trajectories in one plot."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    for res in results:
+        if res.error:
+            continue
+        x = res.cv if cv_spec is not None else np.arange(res.no_frames)
+        ax.plot(x, res.energies, "s" if cv_spec else "o", label=res.file_path)
+    if cv_spec is not None:
+        print("Plotting Energies vs Coordinate")
+        ax.set(xlabel=cv_spec, ylabel="Energy / E_h", title="Energy vs Coordinate")
+    else:
         print("Plotting Energies vs Geometries")
-        X = np.arange(NO_GEOM)
-        fig, ax = plt.subplots()
-        ax.plot(X, E_array, "o")
         ax.set(xlabel="Geometry idx", ylabel="Energy / E_h", title="Energy vs Geometry")
+    if len(results) > 1:
+        ax.legend()
+    plt.show(block=True)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="analyze_trj_xyz.py",
+        description="Energies of .trj.xyz trajectories (xtb, ORCA, CREST, ...), "
+        "the comment line format is detected automatically.",
+    )
+    parser.add_argument("files", nargs="+", help="trajectories or glob patterns")
+    parser.add_argument(
+        "-xtb",
+        dest="comment_format",
+        action="store_const",
+        const="xtb",
+        help="force xtb comment lines",
+    )
+    parser.add_argument(
+        "-orca",
+        dest="comment_format",
+        action="store_const",
+        const="orca",
+        help="force ORCA comment lines",
+    )
+    parser.add_argument(
+        "-print", "-plot", dest="plot", action="store_true", help="plot the energies"
+    )
+    parser.add_argument(
+        "-frame", type=int, help="print only geometry N (random access, one file)"
+    )
+    parser.add_argument(
+        "-cv", help="energy vs coordinate, e.g. -cv d:3,14 (see trj_descriptors.py)"
+    )
+    parser.add_argument(
+        "-toxyz", metavar="OUT", help="write the binary cache back to an xyz file"
+    )
+    parser.add_argument(
+        "-nocache", action="store_true", help="do not read or write .cache.npz files"
+    )
+    parser.add_argument(
+        "-jobs",
+        type=int,
+        default=0,
+        help="worker processes for many files (default: all cores)",
+    )
+    parser.add_argument(
+        "-summary", metavar="CSV", help="write the summary table as csv"
+    )
+    args = parser.parse_args(argv)
+
+    file_paths = expand_paths(args.files)
+    if not file_paths:
+        sys.exit("ERROR: no files match " + " ".join(args.files))
+    if (args.frame is not None or args.toxyz) and len(file_paths) != 1:
+        sys.exit("ERROR: -frame and -toxyz work on exactly one file")
+    if args.cv is not None:
+        try:
+            parse_cv(args.cv)
+        except ValueError as err:
+            sys.exit(f"ERROR: {err}")
 
-        plt.show(block=True)
+    if args.toxyz:
+        try:
+            no_frames = trj_cache_to_xyz(file_paths[0], args.toxyz)
+        except (OSError, KeyError, ValueError) as err:
+            sys.exit(f"ERROR: cannot read the cache of {file_paths[0]}: {err}")
+        print(f"{no_frames} geometries written to {args.toxyz}")
+        return
+
+    if args.frame is not None:
+        with Trajectory(file_paths[0], args.comment_format) as traj:
+            try:
+                frame = traj[args.frame]
+            except IndexError as err:
+                sys.exit(f"ERROR: {err}")
+            mol = Molecule(frame.elements, frame.coordinates, frame.comment)
+            print(format_xyz(mol), end="")
+        return
+
+    options = dict(
+        comment_format=args.comment_format,
+        cv_spec=args.cv,
+        use_cache=not args.nocache,
+    )
+    if len(file_paths) == 1:
+        print("Reading file: " + file_paths[0])
+        results = [_analyze_or_error(file_paths[0], **options)]
+        if results[0].error:
+            sys.exit("INVALID FILE FORMAT: " + results[0].error)
+        print_details(results[0], args.cv)
+    else:
+        print(f"Reading {len(file_paths)} files")
+        results = list(analyze_trajectories(file_paths, args.jobs, **options))
+    print()
+    print(summary_table(results))
+    if args.summary:
+        write_summary_csv(results, args.summary)
+        print("Summary written to " + args.summary)
+    if args.plot:
+        plot_energies(results, args.cv)
+
+
+if __name__ == "__main__":
+    main()
 
 
 ################################
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.1
+
+Gaussian cube files (e.g. *_mep.cube of orca_mep.py, orca_plot densities) as
+NumPy arrays:
+    - read_cube / write_cube   header line by line, the values in one bulk
+                               np.fromfile read / block-formatted write
+    - load_cube                read_cube with a binary <cube>.cache.npz next to
+                               the file (reused while size and mtime match)
+    - Cube + - * / Cube|number on identical grids
+    - resample(shape)          trilinear, one axis after the other
+    - downsample(factor)       every factor-th point (no interpolation)
+    - values_at(points)        trilinear values at arbitrary points (bohr)
+    - isosurface_values(density, prop, iso)
+                               prop (e.g. MEP) where density crosses iso: the
+                               crossing on every grid edge is interpolated
+                               linearly, prop trilinearly at that point
+
+All lengths are in bohr (cubes in Angstrom, negative voxel counts on all
+three axes, are converted on reading; mixed signs are rejected).
+
+Usage:
+    python3 cube_tools.py info water_mep.cube
+    python3 cube_tools.py diff a.cube b.cube -o a-b.cube
+    python3 cube_tools.py downsample water_mep.cube --factor 2
+    python3 cube_tools.py resample water_mep.cube --shape 40 40 60
+    python3 cube_tools.py surface water_dens.cube water_mep.cube --iso 0.001
+"""
+
+# * Changelog:
+# * 0.1.1 - Unit sign checked on all axes, number / Cube
+# * 0.1.0 - Initial release
+
+import argparse
+import os
+import sys
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from orca_mep import cube_row_format, write_blocks
+
+VERSION = "0.1.1"
+
+CACHE_SUFFIX = ".cache.npz"
+AA_TO_BOHR = 1.0 / 0.5291772083
+
+
+class Cube:
+    """
+    Values (nx, ny, nz) on the grid origin + i*axes[0] + j*axes[1] + k*axes[2]
+    (bohr), the atoms (numbers, charges, coordinates in bohr) and the two
+    comment lines.
+    """
+
+    __slots__ = (
+        "comments",
+        "origin",
+        "axes",
+        "numbers",
+        "charges",
+        "coordinates",
+        "data",
+    )
+
+    def __init__(
+        self,
+        data: np.ndarray,
+        origin: Sequence[float],
+        axes: np.ndarray,
+        numbers: Sequence[int] = (),
+        charges: Optional[Sequence[float]] = None,
+        coordinates: Optional[np.ndarray] = None,
+        comments: Tuple[str, str] = ("Generated with cube_tools.py", ""),
+    ):
+        self.data = np.asarray(data, dtype=float)
+        self.origin = np.asarray(origin, dtype=float).reshape(3)
+        self.axes = np.asarray(axes, dtype=float).reshape(3, 3)
+        self.numbers = np.asarray(numbers, dtype=int).reshape(-1)
+        self.charges = (
+            np.zeros(len(self.numbers))
+            if charges is None
+            else np.asarray(charges, dtype=float).reshape(-1)
+        )
+        self.coordinates = (
+            np.zeros((len(self.numbers), 3))
+            if coordinates is None
+            else np.asarray(coordinates, dtype=float).reshape(-1, 3)
+        )
+        self.comments = tuple(comments)
+        if self.data.ndim != 3:
+            raise ValueError(f"Cube data must be 3D, got shape {self.data.shape}")
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.data.shape
+
+    def __repr__(self) -> str:
+        return f"Cube({'x'.join(map(str, self.shape))}, {len(self.numbers)} atoms)"
+
+    # * ---------------- grid ----------------
+
+    def like(self, data: np.ndarray, comments: Optional[Tuple[str, str]] = None):
+        """New cube with the same grid and atoms."""
+        return Cube(
+            data,
+            self.origin,
+            self.axes,
+            self.numbers,
+            self.charges,
+            self.coordinates,
+            comments or self.comments,
+        )
+
+    def same_grid(self, other: "Cube", atol: float = 1e-5) -> bool:
+        return (
+            self.shape == other.shape
+            and np.allclose(self.origin, other.origin, atol=atol)
+            and np.allclose(self.axes, other.axes, atol=atol)
+        )
+
+    def points(self) -> np.ndarray:
+        """All grid points (bohr) as (n, 3), x slowest and z fastest."""
+        idx = np.indices(self.shape).reshape(3, -1).T
+        return self.origin + idx @ self.axes
+
+    def fractional_indices(self, points: np.ndarray) -> np.ndarray:
+        """Grid indices (float) of points in bohr."""
+        rel = np.asarray(points, dtype=float).reshape(-1, 3) - self.origin
+        return np.linalg.solve(self.axes.T, rel.T).T
+
+    def values_at(self, points: np.ndarray, fill: float = np.nan) -> np.ndarray:
+        """Trilinear values at points (bohr), fill outside the grid."""
+        return trilinear(self.data, self.fractional_indices(points), fill)
+
+    def resample(self, shape: Sequence[int]) -> "Cube":
+        """Same box with shape points per axis, trilinear interpolation."""
+        data = self.data
+        axes = self.axes.copy()
+        for axis, new in enumerate(shape):
+            old = data.shape[axis]
+            if new < 2 or old < 2:
+                raise ValueError("Resampling needs at least 2 points per axis")
+            data = _resample_axis(data, axis, new)
+            axes[axis] *= (old - 1) / (new - 1)
+        out = self.like(data)
+        out.axes = axes
+        return out
+
+    def downsample(self, factor: int) -> "Cube":
+        """Every factor-th point along each axis (the grid values are kept)."""
+        if factor < 1:
+            raise ValueError(f"Invalid downsampling factor {factor}")
+        out = self.like(np.ascontiguousarray(self.data[::factor, ::factor, ::factor]))
+        out.axes = self.axes * factor
+        return out
+
+    # * ---------------- arithmetic ----------------
+
+    def _operand(self, other: Union["Cube", float]):
+        if isinstance(other, Cube):
+            if not self.same_grid(other):
+                raise ValueError(f"Cubes on different grids: {self} and {other}")
+            return other.data
+        return other
+
+    def __add__(self, other):
+        return self.like(self.data + self._operand(other))
+
+    def __sub__(self, other):
+        return self.like(self.data - self._operand(other))
+
+    def __mul__(self, other):
+        return self.like(self.data * self._operand(other))
+
+    def __truediv__(self, other):
+        return self.like(self.data / self._operand(other))
+
+    def __neg__(self):
+        return self.like(-self.data)
+
+    __radd__ = __add__
+    __rmul__ = __mul__
+
+    def __rsub__(self, other):
+        return self.like(other - self.data)
+
+    def __rtruediv__(self, other):
+        return self.like(other / self.data)
+
+
+def trilinear(data: np.ndarray, idx: np.ndarray, fill: float = np.nan) -> np.ndarray:
+    """
+    Trilinear interpolation of data at fractional indices idx (m, 3). Axes
+    with a single point (planar cubes) are constant along that direction.
+    """
+    shape = np.array(data.shape)
+    idx = np.asarray(idx, dtype=float).reshape(-1, 3)
+    inside = np.all((idx >= 0.0) & (idx <= shape - 1), axis=1)
+    base = np.clip(np.floor(idx).astype(int), 0, np.maximum(shape - 2, 0))
+    t = np.where(shape > 1, idx - base, 0.0)
+    values = np.zeros(len(idx))
+    for corner in np.ndindex(2, 2, 2):
+        weight = np.prod(np.where(corner, t, 1.0 - t), axis=1)
+        i, j, k = np.minimum(base + corner, shape - 1).T
+        values += weight * data[i, j, k]
+    values[~inside] = fill
+    return values
+
+
+def _resample_axis(data: np.ndarray, axis: int, new: int) -> np.ndarray:
+    """Linear interpolation of data along one axis onto new equidistant points."""
+    old = data.shape[axis]
+    pos = np.linspace(0.0, old - 1, new)
+    lower = np.minimum(np.floor(pos).astype(int), old - 2)
+    t = pos - lower
+    shape = [1, 1, 1]
+    shape[axis] = new
+    t = t.reshape(shape)
+    return (
+        np.take(data, lower, axis=axis) * (1.0 - t)
+        + np.take(data, lower + 1, axis=axis) * t
+    )
+
+
+def isosurface_values(
+    density: Cube, prop: Cube, iso: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Points (bohr, (m, 3)) where density crosses iso on the grid edges and the
+    values of prop there (e.g. the MEP on the 0.001 a.u. density surface).
+    """
+    crossings = []
+    for axis in range(3):
+        lower = [slice(None)] * 3
+        upper = [slice(None)] * 3
+        lower[axis] = slice(None, -1)
+        upper[axis] = slice(1, None)
+        a, b = density.data[tuple(lower)], density.data[tuple(upper)]
+        edges = np.argwhere((a - iso) * (b - iso) < 0.0)
+        fa, fb = a[tuple(edges.T)], b[tuple(edges.T)]
+        idx = edges.astype(float)
+        idx[:, axis] += (iso - fa) / (fb - fa)
+        crossings.append(idx)
+    idx = np.concatenate(crossings)
+    points = density.origin + idx @ density.axes
+    if prop.same_grid(density):
+        values = trilinear(prop.data, idx)
+    else:
+        values = prop.values_at(points)
+    return points, values
+
+
+# * ---------------- input / output ----------------
+
+
+def _header_line(fp, types):
+    parts = fp.readline().split()
+    return [kind(part) for kind, part in zip(types, parts)]
+
+
+def read_cube(path: str) -> Cube:
+    """Reads a cube; the values are parsed by one np.fromfile call."""
+    with open(path, "rb") as fp:
+        comments = (
+            fp.readline().decode().rstrip("\r\n"),
+            fp.readline().decode().rstrip("\r\n"),
+        )
+        no_atoms, *origin = _header_line(fp, (int, float, float, float))
+        counts = np.empty(3, dtype=int)
+        axes = np.empty((3, 3))
+        for i in range(3):
+            counts[i], *axes[i] = _header_line(fp, (int, float, float, float))
+        #! negative counts: the voxel vectors are given in Angstrom. The sign
+        #! is per axis, but the origin and atoms have one unit: no mixing
+        in_aa = counts < 0
+        if in_aa.any() and not in_aa.all():
+            raise ValueError(f"{path}: mixed Bohr/Angstrom voxel counts {counts}")
+        in_aa = bool(in_aa.all())
+        counts = np.abs(counts)
+        atoms = np.array(
+            [fp.readline().split()[:5] for _ in range(abs(no_atoms))], dtype=float
+        ).reshape(-1, 5)
+        if no_atoms < 0:  # * orbital cubes: line with the number of orbitals
+            no_values = int(fp.readline().split()[0])
+            if no_values != 1:
+                raise ValueError(f"{path}: cubes with {no_values} orbitals")
+        data = np.fromfile(fp, sep=" ")
+
+    if data.size != np.prod(counts):
+        raise ValueError(f"{path}: {data.size} values, expected {np.prod(counts)}")
+    origin, coordinates = np.array(origin), atoms[:, 2:]
+    if in_aa:
+        origin, axes, coordinates = (
+            origin * AA_TO_BOHR,
+            axes * AA_TO_BOHR,
+            coordinates * AA_TO_BOHR,
+        )
+    return Cube(
+        data.reshape(counts),
+        origin,
+        axes,
+        atoms[:, 0].astype(int),
+        atoms[:, 1],
+        coordinates,
+        comments,
+    )
+
+
+def write_cube(path: str, cube: Cube) -> None:
+    """Writes a cube in the layout of orca_mep.py (bohr, 6 values per line)."""
+    with open(path, "w") as fp:
+        fp.write(cube.comments[0] + "\n" + cube.comments[1] + "\n")
+        fp.write(
+            "{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n".format(
+                len(cube.numbers), *cube.origin
+            )
+        )
+        for count, axis in zip(cube.shape, cube.axes):
+            fp.write("{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n".format(count, *axis))
+        atom_block = np.column_stack((cube.numbers, cube.charges, cube.coordinates))
+        write_blocks(fp, atom_block, "%5d%12.6f%12.6f%12.6f%12.6f\n")
+        nz = cube.shape[2]
+        write_blocks(fp, cube.data.reshape(-1, nz), cube_row_format(nz))
+
+
+def cache_path(path: str) -> str:
+    return path + CACHE_SUFFIX
+
+
+def save_cache(path: str, cube: Cube, source: Optional[str] = None) -> None:
+    """Binary copy of a cube; with source, its size and mtime are recorded."""
+    stat = os.stat(source) if source else None
+    tmp_path = path + ".tmp.npz"
+    try:
+        np.savez(
+            tmp_path,
+            data=cube.data,
+            origin=cube.origin,
+            axes=cube.axes,
+            numbers=cube.numbers,
+            charges=cube.charges,
+            coordinates=cube.coordinates,
+            comments=np.array(cube.comments),
+            size=np.array(stat.st_size if stat else -1),
+            mtime_ns=np.array(stat.st_mtime_ns if stat else -1),
+        )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_cache(path: str, source: Optional[str] = None) -> Optional[Cube]:
+    """Cube of a cache file, None if it does not belong to the source file."""
+    try:
+        with np.load(path) as cache:
+            if source is not None:
+                stat = os.stat(source)
+                if (
+                    int(cache["size"]) != stat.st_size
+                    or int(cache["mtime_ns"]) != stat.st_mtime_ns
+                ):
+                    return None
+            return Cube(
+                cache["data"],
+                cache["origin"],
+                cache["axes"],
+                cache["numbers"],
+                cache["charges"],
+                cache["coordinates"],
+                tuple(str(line) for line in cache["comments"]),
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def load_cube(path: str, use_cache: bool = True) -> Cube:
+    """
+    Cube from a .cube file or a .npz cache. For .cube files the cache next to
+    the file is used while it matches the file, otherwise it is (re)written.
+    """
+    if path.endswith(".npz"):
+        cube = _read_cache(path)
+        if cube is None:
+            raise ValueError(f"{path} is not a cube cache")
+        return cube
+    if use_cache:
+        cube = _read_cache(cache_path(path), source=path)
+        if cube is not None:
+            return cube
+    cube = read_cube(path)
+    if use_cache:
+        try:
+            save_cache(cache_path(path), cube, source=path)
+        except OSError:
+            pass  # * read-only directory: no cache
+    return cube
+
+
+# * ---------------- command line ----------------
+
+
+def output_name(path: str, suffix: str) -> str:
+    filename = path[: -len(CACHE_SUFFIX)] if path.endswith(CACHE_SUFFIX) else path
+    return os.path.splitext(filename)[0] + suffix + ".cube"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="cube_tools.py", description=f"Cube file toolkit. Version {VERSION}"
+    )
+    parser.add_argument(
+        "--nocache", action="store_true", help="do not read/write .cache.npz files"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info = commands.add_parser("info", help="grid and value statistics")
+    info.add_argument("cubes", nargs="+")
+
+    for name, text in (("add", "a + b"), ("diff", "a - b")):
+        cmd = commands.add_parser(name, help=f"{text} on identical grids")
+        cmd.add_argument("a")
+        cmd.add_argument("b")
+        cmd.add_argument("-o", "--output", required=True)
+
+    scale = commands.add_parser("scale", help="values times a factor")
+    scale.add_argument("cube")
+    scale.add_argument("factor", type=float)
+    scale.add_argument("-o", "--output")
+
+    down = commands.add_parser("downsample", help="every n-th grid point")
+    down.add_argument("cube")
+    down.add_argument("--factor", type=int, default=2)
+    down.add_argument("-o", "--output")
+
+    res = commands.add_parser("resample", help="trilinear onto a new shape")
+    res.add_argument("cube")
+    res.add_argument("--shape", type=int, nargs=3, required=True)
+    res.add_argument("-o", "--output")
+
+    surf = commands.add_parser(
+        "surface", help="property (e.g. MEP) on a density isosurface"
+    )
+    surf.add_argument("density")
+    surf.add_argument("prop")
+    surf.add_argument("--iso", type=float, default=0.001)
+    surf.add_argument("-o", "--output", help="x y z value table (bohr)")
+
+    args = parser.parse_args(argv)
+    use_cache = not args.nocache
+
+    try:
+        if args.command == "info":
+            for path in args.cubes:
+                cube = load_cube(path, use_cache)
+                print(f"{path}: {cube}")
+                print(f"  origin {np.array2string(cube.origin, precision=6)}")
+                print(f"  voxel  {np.array2string(cube.axes, precision=6)}")
+                print(
+                    "  min {:.6e}  max {:.6e}  mean {:.6e}".format(
+                        cube.data.min(), cube.data.max(), cube.data.mean()
+                    )
+                )
+        elif args.command in ("add", "diff"):
+            a, b = load_cube(args.a, use_cache), load_cube(args.b, use_cache)
+            out = a + b if args.command == "add" else a - b
+            write_cube(args.output, out)
+        elif args.command == "scale":
+            out = load_cube(args.cube, use_cache) * args.factor
+            write_cube(args.output or output_name(args.cube, "_scaled"), out)
+        elif args.command == "downsample":
+            out = load_cube(args.cube, use_cache).downsample(args.factor)
+            write_cube(args.output or output_name(args.cube, "_down"), out)
+        elif args.command == "resample":
+            out = load_cube(args.cube, use_cache).resample(args.shape)
+            write_cube(args.output or output_name(args.cube, "_resampled"), out)
+        elif args.command == "surface":
+            density = load_cube(args.density, use_cache)
+            prop = load_cube(args.prop, use_cache)
+            points, values = isosurface_values(density, prop, args.iso)
+            ok = ~np.isnan(values)
+            print(f"{len(points)} points on the {args.iso} isosurface")
+            if ok.any():
+                print(
+                    "  min {:.6e}  max {:.6e}  mean {:.6e}".format(
+                        values[ok].min(), values[ok].max(), values[ok].mean()
+                    )
+                )
+            if args.output:
+                np.savetxt(
+                    args.output,
+                    np.column_stack((points, values)),
+                    fmt="%12.6f %12.6f %12.6f %14.5e",
+                )
+    except (OSError, ValueError) as err:
+        sys.exit(f"ERROR: {err}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.2.0
+
+Element data as NumPy vectors indexed by the atomic number Z (index 0 is the
+dummy atom "X"), so lookups for whole molecules or ensembles are one np.take:
+    - SYMBOLS          Z -> symbol
+    - Z_BY_SYMBOL      symbol -> Z (dict, O(1))
+    - MASSES           standard atomic weights in u (IUPAC, abridged; mass
+                       number of the most stable isotope for elements without
+                       a standard weight)
+    - COVALENT_RADII   single bond covalent radii in Angstrom (Cordero et al.,
+                       Dalton Trans. 2008, 2832; C sp3, Mn/Fe/Co low spin),
+                       NaN after Cm
+    - VDW_RADII        van der Waals radii in Angstrom (Bondi, J. Phys. Chem.
+                       1964, 68, 441; main group elements and H from Mantina
+                       et al., J. Phys. Chem. A 2009, 113, 5806), NaN where
+                       neither gives a value (vdw_radii() fills these)
+
+Usage:
+    atomic_numbers(["C", "h", "O"])   -> array([6, 1, 8])
+    symbols_of([6, 1, 8])             -> array(['C', 'H', 'O'])
+    masses(mol.symbols).sum()         -> molecular mass
+    vdw_radii(["C", "Fe"])            -> array([1.7, 2. ])
+"""
+
+# * Changelog:
+# * 0.2.0 - Van der Waals radii
+# * 0.1.0 - Initial release
+
+from typing import Dict, Sequence, Union
+
+import numpy as np
+
+VERSION = "0.2.0"
+
+# fmt: off
+SYMBOLS = np.array([
+    "X",
+    "H", "He",
+    "Li", "Be", "B", "C", "N", "O", "F", "Ne",
+    "Na", "Mg", "Al", "Si", "P", "S", "Cl", "Ar",
+    "K", "Ca",
+    "Sc", "Ti", "V", "Cr", "Mn", "Fe", "Co", "Ni", "Cu", "Zn",
+    "Ga", "Ge", "As", "Se", "Br", "Kr",
+    "Rb", "Sr",
+    "Y", "Zr", "Nb", "Mo", "Tc", "Ru", "Rh", "Pd", "Ag", "Cd",
+    "In", "Sn", "Sb", "Te", "I", "Xe",
+    "Cs", "Ba",
+    "La", "Ce", "Pr", "Nd", "Pm", "Sm", "Eu", "Gd", "Tb", "Dy", "Ho", "Er", "Tm",
+    "Yb", "Lu",
+    "Hf", "Ta", "W", "Re", "Os", "Ir", "Pt", "Au", "Hg",
+    "Tl", "Pb", "Bi", "Po", "At", "Rn",
+    "Fr", "Ra",
+    "Ac", "Th", "Pa", "U", "Np", "Pu", "Am", "Cm", "Bk", "Cf", "Es", "Fm", "Md",
+    "No", "Lr",
+    "Rf", "Db", "Sg", "Bh", "Hs", "Mt", "Ds", "Rg", "Cn",
+    "Nh", "Fl", "Mc", "Lv", "Ts", "Og",
+])
+
+MASSES = np.array([
+    0.0,
+    1.008, 4.0026,
+    6.94, 9.0122, 10.81, 12.011, 14.007, 15.999, 18.998, 20.180,
+    22.990, 24.305, 26.982, 28.085, 30.974, 32.06, 35.45, 39.948,
+    39.098, 40.078,
+    44.956, 47.867, 50.942, 51.996, 54.938, 55.845, 58.933, 58.693, 63.546, 65.38,
+    69.723, 72.630, 74.922, 78.971, 79.904, 83.798,
+    85.468, 87.62,
+    88.906, 91.224, 92.906, 95.95, 98.0, 101.07, 102.91, 106.42, 107.87, 112.41,
+    114.82, 118.71, 121.76, 127.60, 126.90, 131.29,
+    132.91, 137.33,
+    138.91, 140.12, 140.91, 144.24, 145.0, 150.36, 151.96, 157.25, 158.93, 162.50,
+    164.93, 167.26, 168.93, 173.05, 174.97,
+    178.49, 180.95, 183.84, 186.21, 190.23, 192.22, 195.08, 196.97, 200.59,
+    204.38, 207.2, 208.98, 209.0, 210.0, 222.0,
+    223.0, 226.0,
+    227.0, 232.04, 231.04, 238.03, 237.0, 244.0, 243.0, 247.0, 247.0, 251.0,
+    252.0, 257.0, 258.0, 259.0, 266.0,
+    267.0, 268.0, 269.0, 270.0, 269.0, 278.0, 281.0, 282.0, 285.0,
+    286.0, 289.0, 290.0, 293.0, 294.0, 294.0,
+])
+
+COVALENT_RADII = np.array([
+    0.0,
+    0.31, 0.28,
+    1.28, 0.96, 0.84, 0.76, 0.71, 0.66, 0.57, 0.58,
+    1.66, 1.41, 1.21, 1.11, 1.07, 1.05, 1.02, 1.06,
+    2.03, 1.76,
+    1.70, 1.60, 1.53, 1.39, 1.39, 1.32, 1.26, 1.24, 1.32, 1.22,
+    1.22, 1.20, 1.19, 1.20, 1.20, 1.16,
+    2.20, 1.95,
+    1.90, 1.75, 1.64, 1.54, 1.47, 1.46, 1.42, 1.39, 1.45, 1.44,
+    1.42, 1.39, 1.39, 1.38, 1.39, 1.40,
+    2.44, 2.15,
+    2.07, 2.04, 2.03, 2.01, 1.99, 1.98, 1.98, 1.96, 1.94, 1.92, 1.92, 1.89, 1.90,
+    1.87, 1.87,
+    1.75, 1.70, 1.62, 1.51, 1.44, 1.41, 1.36, 1.36, 1.32,
+    1.45, 1.46, 1.48, 1.40, 1.50, 1.50,
+    2.60, 2.21,
+    2.15, 2.06, 2.00, 1.96, 1.90, 1.87, 1.80, 1.69,
+] + [np.nan] * 22)
+
+_VDW_KNOWN = {
+    "H": 1.10, "He": 1.40,
+    "Li": 1.81, "Be": 1.53, "B": 1.92, "C": 1.70, "N": 1.55, "O": 1.52,
+    "F": 1.47, "Ne": 1.54,
+    "Na": 2.27, "Mg": 1.73, "Al": 1.84, "Si": 2.10, "P": 1.80, "S": 1.80,
+    "Cl": 1.75, "Ar": 1.88,
+    "K": 2.75, "Ca": 2.31,
+    "Ni": 1.63, "Cu": 1.40, "Zn": 1.39,
+    "Ga": 1.87, "Ge": 2.11, "As": 1.85, "Se": 1.90, "Br": 1.83, "Kr": 2.02,
+    "Rb": 3.03, "Sr": 2.49,
+    "Pd": 1.63, "Ag": 1.72, "Cd": 1.58,
+    "In": 1.93, "Sn": 2.17, "Sb": 2.06, "Te": 2.06, "I": 1.98, "Xe": 2.16,
+    "Cs": 3.43, "Ba": 2.68,
+    "Pt": 1.75, "Au": 1.66, "Hg": 1.55,
+    "Tl": 1.96, "Pb": 2.02, "Bi": 2.07, "Po": 1.97, "At": 2.02, "Rn": 2.20,
+    "Fr": 3.48, "Ra": 2.83,
+    "U": 1.86,
+}
+# fmt: on
+
+MAX_Z = len(SYMBOLS) - 1
+
+#! O(1) lookups, also for upper/lower case input ("CL", "cl")
+Z_BY_SYMBOL: Dict[str, int] = {sym: z for z, sym in enumerate(SYMBOLS)}
+_Z_BY_UPPER: Dict[str, int] = {sym.upper(): z for z, sym in enumerate(SYMBOLS)}
+
+VDW_RADII = np.full(len(SYMBOLS), np.nan)
+VDW_RADII[[Z_BY_SYMBOL[sym] for sym in _VDW_KNOWN]] = list(_VDW_KNOWN.values())
+DEFAULT_VDW_RADIUS = 2.0  # * Angstrom, for elements without a tabulated value
+
+Atoms = Union[Sequence[str], Sequence[int], np.ndarray]
+
+
+def atomic_number(symbol: str) -> int:
+    """Z of one symbol (any case); atomic numbers as text are accepted."""
+    symbol = symbol.strip()
+    if symbol.isdigit():
+        return int(symbol)
+    try:
+        return Z_BY_SYMBOL[symbol]
+    except KeyError:
+        try:
+            return _Z_BY_UPPER[symbol.upper()]
+        except KeyError:
+            raise ValueError(f"Unknown element symbol {symbol!r}") from None
+
+
+def atomic_numbers(atoms: Atoms) -> np.ndarray:
+    """
+    Z of every atom; symbols are looked up once per distinct symbol, so this
+    is fast for whole ensembles. Integer input is returned as is.
+    """
+    atoms = np.asarray(atoms)
+    if np.issubdtype(atoms.dtype, np.integer):
+        return atoms
+    unique, inverse = np.unique(atoms, return_inverse=True)
+    numbers = np.array([atomic_number(str(sym)) for sym in unique], dtype=int)
+    return numbers[inverse].reshape(atoms.shape)
+
+
+def symbols_of(numbers: Sequence[int]) -> np.ndarray:
+    """Symbols of atomic numbers (one np.take)."""
+    return np.take(SYMBOLS, numbers)
+
+
+def masses(atoms: Atoms) -> np.ndarray:
+    """Atomic masses (u) of symbols or atomic numbers."""
+    return np.take(MASSES, atomic_numbers(atoms))
+
+
+def covalent_radii(atoms: Atoms) -> np.ndarray:
+    """Covalent radii (Angstrom) of symbols or atomic numbers."""
+    return np.take(COVALENT_RADII, atomic_numbers(atoms))
+
+
+def vdw_radii(atoms: Atoms, default: float = DEFAULT_VDW_RADIUS) -> np.ndarray:
+    """Van der Waals radii (Angstrom), default for elements without a value."""
+    radii = np.take(VDW_RADII, atomic_numbers(atoms))
+    return np.where(np.isnan(radii), default, radii)
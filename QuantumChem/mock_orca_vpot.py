@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.0
+
+Stand-in for orca_vpot to test orca_mep.py without ORCA. Same command line
+and output layout as the real program:
+    mock_orca_vpot.py <basename>.gbw <basename>.scfp <grid>.inp <grid>.out
+    <grid>.out: number of points, then "x y z V" (bohr, E_h/e) per line
+
+The .gbw and .scfp files are not read (they do not even have to exist).
+V is the potential of the bare nuclei of <basename>.xyz (softened near the
+nuclei), or of a unit charge in the origin if there is no .xyz, so the cube
+looks like a molecule and shards can be checked against a single run.
+
+Usage:
+    python3 orca_mep.py water 40 --vpot ./mock_orca_vpot.py --shards 4
+"""
+
+# * Changelog:
+# * 0.1.0 - Initial release
+
+import os
+import sys
+
+import numpy as np
+
+from element_data import atomic_numbers
+from mol_io import read_molecule
+
+VERSION = "0.1.0"
+
+ANG_TO_AU = 1.0 / 0.5291772083
+SOFTENING = 0.5  # * bohr**2
+
+
+def nuclei(gbw: str):
+    """Charges and positions (bohr) from the .xyz next to the .gbw."""
+    xyz = os.path.splitext(gbw)[0] + ".xyz"
+    if not os.path.isfile(xyz):
+        return np.ones(1), np.zeros((1, 3))
+    mol = read_molecule(xyz, "xyz")
+    return atomic_numbers(mol.symbols).astype(float), mol.coordinates * ANG_TO_AU
+
+
+def potential(points: np.ndarray, charges: np.ndarray, positions: np.ndarray):
+    vpot = np.zeros(len(points))
+    for charge, position in zip(charges, positions):
+        r2 = np.sum((points - position) ** 2, axis=1)
+        vpot += charge / np.sqrt(r2 + SOFTENING)
+    return vpot
+
+
+def main(argv) -> None:
+    if len(argv) != 4:
+        sys.exit("Usage: mock_orca_vpot.py file.gbw file.scfp grid.inp grid.out")
+    gbw, _, inp, out = argv
+    with open(inp) as fp:
+        no_points = int(fp.readline())
+        points = np.loadtxt(fp, ndmin=2).reshape(-1, 3)
+    if len(points) != no_points:
+        sys.exit(f"{inp}: {len(points)} points, expected {no_points}")
+    vpot = potential(points, *nuclei(gbw))
+    with open(out, "w") as fp:
+        fp.write(f"{no_points}\n")
+        np.savetxt(
+            fp, np.column_stack((points, vpot)), fmt="%14.6f %14.6f %14.6f %20.12e"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.2.0
+
+Molecular structure I/O for all scripts, with a registry of formats:
+    - xyz:       one structure (first frame of an xyz file)
+    - multi-xyz: all frames (trajectories, crest_conformers.xyz, ...)
+    - tinker:    Chem3D/Tinker xyz (count + title line, index and atom type
+                 columns, negative atom counts are accepted)
+    - bare:      "El x y z" lines without count and comment line (coordinate
+                 dumps, sniffed from .xyz files)
+    - coord:     Turbomole coord ($coord block in Bohr, e.g. for CENSO)
+    - orca:      last CARTESIAN COORDINATES (ANGSTROEM) block of an ORCA output
+                 (found through the section index, no full read)
+The format is guessed from the file name and the first lines if not given.
+
+Structures are array backed: a Molecule holds the symbols (n,) and the
+coordinates (n, 3) in Angstrom, an Ensemble the coordinates of all frames as
+(n_frames, n_atoms, 3) plus one comment per frame. Readers stream (one frame at
+a time) and parse the atom lines of a frame with one np.loadtxt call, writers
+format a whole frame in one call and write it at once. "," is accepted as
+decimal separator.
+
+Usage:
+    from mol_io import read_molecule, read_ensemble, write
+    mol = read_molecule("water.xyz")
+    ens = read_ensemble("crest_conformers.xyz")
+    write("coord", mol, fmt="coord")
+    write("best.xyz", ens[:5])
+"""
+
+# * Changelog:
+# * 0.2.0 - "bare" format (atom lines only), atom blocks parsed with np.loadtxt
+# * 0.1.1 - Tinker files without title (bare count line) are recognized
+# * 0.1.0 - Initial release
+
+import os
+from itertools import islice
+from typing import (
+    IO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+VERSION = "0.2.0"
+
+BOHR_TO_AA = 0.529177210903
+LINE_FORMAT = "%-2s %16.10f %16.10f %16.10f\n"
+COORD_LINE_FORMAT = "%20.14f %20.14f %20.14f  %s\n"
+
+
+class Molecule:
+    """One structure: symbols (n,), coordinates (n, 3) in Angstrom, comment."""
+
+    __slots__ = ("symbols", "coordinates", "comment")
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        coordinates: np.ndarray,
+        comment: str = "",
+    ):
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 3)
+        self.comment = comment
+        if len(self.symbols) != len(self.coordinates):
+            raise ValueError(
+                f"{len(self.symbols)} symbols, but {len(self.coordinates)} coordinates"
+            )
+
+    @property
+    def no_atoms(self) -> int:
+        return len(self.symbols)
+
+    def __len__(self) -> int:
+        return self.no_atoms
+
+    def __repr__(self) -> str:
+        return f"Molecule({self.no_atoms} atoms, comment={self.comment!r})"
+
+
+class Ensemble:
+    """
+    Frames with the same atoms: symbols (n_atoms,), coordinates
+    (n_frames, n_atoms, 3) in Angstrom and one comment per frame.
+    """
+
+    __slots__ = ("symbols", "coordinates", "comments")
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        coordinates: np.ndarray,
+        comments: Optional[Sequence[str]] = None,
+    ):
+        self.symbols = np.asarray(symbols, dtype=str)
+        self.coordinates = np.asarray(coordinates, dtype=float).reshape(
+            -1, len(self.symbols), 3
+        )
+        if comments is None:
+            comments = [""] * len(self.coordinates)
+        self.comments = list(comments)
+
+    @classmethod
+    def from_molecules(cls, molecules: Iterable[Molecule]) -> "Ensemble":
+        molecules = list(molecules)
+        if not molecules:
+            raise ValueError("No structures")
+        symbols = molecules[0].symbols
+        for idx, mol in enumerate(molecules):
+            if not np.array_equal(mol.symbols, symbols):
+                raise ValueError(f"Frame {idx} has different atoms than frame 0")
+        return cls(
+            symbols,
+            np.stack([mol.coordinates for mol in molecules]),
+            [mol.comment for mol in molecules],
+        )
+
+    @property
+    def no_atoms(self) -> int:
+        return len(self.symbols)
+
+    def __len__(self) -> int:
+        return len(self.coordinates)
+
+    def __getitem__(self, key):
+        if isinstance(key, (slice, list, np.ndarray)):
+            index = np.arange(len(self))[key]
+            return Ensemble(
+                self.symbols,
+                self.coordinates[index],
+                [self.comments[idx] for idx in index],
+            )
+        return Molecule(self.symbols, self.coordinates[key], self.comments[key])
+
+    def __iter__(self) -> Iterator[Molecule]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __repr__(self) -> str:
+        return f"Ensemble({len(self)} frames, {self.no_atoms} atoms)"
+
+
+Structures = Union[Molecule, Ensemble, Iterable[Molecule]]
+
+
+def _atom_block(lines: Sequence[str], columns: slice, symbol_col: int) -> Molecule:
+    """
+    Symbols and coordinates of atom lines in one go: a single np.loadtxt call
+    reads the symbol and coordinate columns (further columns, e.g. the Tinker
+    connectivity, may differ from line to line).
+    """
+    if not lines:
+        return Molecule([], np.zeros((0, 3)))
+    usecols = (symbol_col, *range(columns.start, columns.stop))
+    rows = "".join(lines).replace(",", ".").splitlines()
+    try:
+        table = np.loadtxt(rows, dtype=str, usecols=usecols, comments=None, ndmin=2)
+        coords = table[:, 1:].astype(float)
+    except ValueError:
+        raise ValueError("Invalid atom line in coordinate block") from None
+    return Molecule(table[:, 0], coords)
+
+
+def _read_xyz_frames(fp: IO[str], tinker: bool = False) -> Iterator[Molecule]:
+    while True:
+        header = fp.readline()
+        if not header.strip():
+            return
+        parts = header.split(None, 1)
+        try:
+            no_atoms = abs(int(parts[0]))  # * Chem3D writes negative counts
+        except ValueError:
+            raise ValueError(f"Invalid atom count line {header!r}") from None
+        if tinker:
+            comment = parts[1].strip() if len(parts) > 1 else ""
+        else:
+            comment = fp.readline().rstrip("\r\n")
+        lines = list(islice(fp, no_atoms))
+        if len(lines) < no_atoms:
+            raise ValueError(f"Incomplete frame: {len(lines)} of {no_atoms} atoms")
+        if tinker:
+            mol = _atom_block(lines, slice(2, 5), 1)
+        else:
+            mol = _atom_block(lines, slice(1, 4), 0)
+        mol.comment = comment
+        yield mol
+
+
+def read_multi_xyz(fp: IO[str]) -> Iterator[Molecule]:
+    yield from _read_xyz_frames(fp)
+
+
+def read_xyz(fp: IO[str]) -> Iterator[Molecule]:
+    yield from islice(_read_xyz_frames(fp), 1)
+
+
+def read_tinker(fp: IO[str]) -> Iterator[Molecule]:
+    yield from _read_xyz_frames(fp, tinker=True)
+
+
+def read_bare(fp: IO[str]) -> Iterator[Molecule]:
+    """Atom lines "El x y z" only, up to the first empty line."""
+    lines: List[str] = []
+    for line in fp:
+        if not line.strip():
+            break
+        lines.append(line)
+    yield _atom_block(lines, slice(1, 4), 0)
+
+
+def read_coord(fp: IO[str]) -> Iterator[Molecule]:
+    """Turbomole $coord block (Bohr, lower case symbols)."""
+    lines: List[str] = []
+    in_block = False
+    for line in fp:
+        if line.startswith("$"):
+            if in_block:
+                break
+            in_block = line.split()[0] == "$coord"
+        elif in_block and line.strip():
+            lines.append(line)
+    if not in_block:
+        raise ValueError("No $coord block")
+    mol = _atom_block(lines, slice(0, 3), 3)
+    mol.symbols = np.char.capitalize(mol.symbols)
+    mol.coordinates *= BOHR_TO_AA
+    yield mol
+
+
+def read_orca(fp: IO[str]) -> Iterator[Molecule]:
+    """Last CARTESIAN COORDINATES (ANGSTROEM) block of an ORCA output."""
+    from orca_section_index import build_section_index, last_geometry
+
+    filename = fp.name
+    lines = last_geometry(filename, build_section_index(filename))
+    if not lines:
+        raise ValueError(f"No CARTESIAN COORDINATES (ANGSTROEM) in {filename}")
+    mol = _atom_block(lines, slice(1, 4), 0)
+    mol.comment = os.path.basename(filename)
+    yield mol
+
+
+def format_xyz(mol: Molecule) -> str:
+    """xyz text of one frame."""
+    rows = zip(mol.symbols.tolist(), *mol.coordinates.T.tolist())
+    comment = mol.comment.replace("\n", " ")
+    return f"{mol.no_atoms}\n{comment}\n" + "".join(map(LINE_FORMAT.__mod__, rows))
+
+
+def write_xyz(fp: IO[str], molecules: Iterable[Molecule]) -> None:
+    for mol in molecules:
+        fp.write(format_xyz(mol))
+
+
+def write_tinker(fp: IO[str], molecules: Iterable[Molecule]) -> None:
+    """Tinker xyz without atom types and bonds (type 0)."""
+    for mol in molecules:
+        rows = zip(
+            range(1, mol.no_atoms + 1),
+            mol.symbols.tolist(),
+            *mol.coordinates.T.tolist(),
+        )
+        fp.write(
+            f"{mol.no_atoms:6d}  {mol.comment}\n"
+            + "".join("%6d  %-2s %12.6f %12.6f %12.6f     0\n" % row for row in rows)
+        )
+
+
+def write_coord(fp: IO[str], molecules: Iterable[Molecule]) -> None:
+    """Turbomole coord of the first structure."""
+    for mol in molecules:
+        rows = zip(
+            *(mol.coordinates / BOHR_TO_AA).T.tolist(),
+            np.char.lower(mol.symbols).tolist(),
+        )
+        fp.write("$coord\n" + "".join(map(COORD_LINE_FORMAT.__mod__, rows)) + "$end\n")
+        return
+
+
+class IOFormat(NamedTuple):
+    name: str
+    reader: Callable[[IO[str]], Iterator[Molecule]]
+    writer: Optional[Callable[[IO[str], Iterable[Molecule]], None]]
+    extensions: Sequence[str]
+
+
+FORMATS: Dict[str, IOFormat] = {}
+
+
+def register_format(
+    name: str,
+    reader: Callable[[IO[str]], Iterator[Molecule]],
+    writer: Optional[Callable[[IO[str], Iterable[Molecule]], None]] = None,
+    extensions: Sequence[str] = (),
+) -> None:
+    """Adds a format (reader yields Molecules, writer takes an iterable)."""
+    FORMATS[name] = IOFormat(name, reader, writer, tuple(extensions))
+
+
+register_format("xyz", read_xyz, write_xyz, (".xyz",))
+register_format("multi-xyz", read_multi_xyz, write_xyz, (".trj.xyz", ".xyz"))
+register_format("tinker", read_tinker, write_tinker, (".txyz", ".arc"))
+register_format("bare", read_bare, None, ())
+register_format("coord", read_coord, write_coord, ("coord",))
+register_format("orca", read_orca, None, (".out", ".log"))
+
+
+def _is_float(text: str) -> bool:
+    try:
+        float(text.replace(",", "."))
+        return True
+    except ValueError:
+        return False
+
+
+def _is_tinker(path: str) -> bool:
+    """
+    Tinker (Chem3D): negative atom count, or the second line is an atom line
+    "index symbol x y z type/connectivity..." (the title is optional).
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as fp:
+        head = [fp.readline().split() for _ in range(2)]
+    if head[0] and head[0][0].lstrip("-").isdigit() and int(head[0][0]) < 0:
+        return True
+    atom = head[1]
+    return (
+        len(atom) >= 6
+        and atom[0].isdigit()
+        and not _is_float(atom[1])
+        and all(_is_float(part) for part in atom[2:5])
+    )
+
+
+def _is_bare(path: str) -> bool:
+    """The first line is already an atom line "El x y z" (no count line)."""
+    with open(path, "r", encoding="utf-8", errors="replace") as fp:
+        parts = fp.readline().split()
+    return len(parts) >= 4 and all(_is_float(part) for part in parts[1:4])
+
+
+def guess_format(path: str, multi: bool = True) -> str:
+    """Format name from the file name (and the first lines of .xyz files)."""
+    name = os.path.basename(path).lower()
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8", errors="replace") as fp:
+            if fp.readline().startswith("$coord"):
+                return "coord"
+    for fmt in FORMATS.values():
+        if name in fmt.extensions:  # * e.g. "coord"
+            return fmt.name
+    if name.endswith(".xyz"):
+        if os.path.isfile(path) and _is_tinker(path):
+            return "tinker"
+        if os.path.isfile(path) and _is_bare(path):
+            return "bare"
+        return "multi-xyz" if multi else "xyz"
+    for fmt in FORMATS.values():
+        if any(name.endswith(ext) for ext in fmt.extensions if ext.startswith(".")):
+            return fmt.name
+    raise ValueError(f"Unknown structure format of {path} ({', '.join(FORMATS)})")
+
+
+def _get(fmt: str) -> IOFormat:
+    try:
+        return FORMATS[fmt]
+    except KeyError:
+        raise ValueError(f"Unknown format {fmt!r} ({', '.join(FORMATS)})") from None
+
+
+def read(path: str, fmt: Optional[str] = None) -> Iterator[Molecule]:
+    """Streams all structures of a file."""
+    reader = _get(fmt or guess_format(path)).reader
+    with open(path, "r", encoding="utf-8", errors="replace") as fp:
+        yield from reader(fp)
+
+
+def read_molecule(path: str, fmt: Optional[str] = None) -> Molecule:
+    """First structure of a file."""
+    for mol in read(path, fmt or guess_format(path, multi=False)):
+        return mol
+    raise ValueError(f"No structure in {path}")
+
+
+def read_ensemble(path: str, fmt: Optional[str] = None) -> Ensemble:
+    """All structures of a file as one Ensemble."""
+    return Ensemble.from_molecules(read(path, fmt))
+
+
+def write(path: str, structures: Structures, fmt: Optional[str] = None) -> None:
+    """Writes a Molecule, an Ensemble or any iterable of Molecules."""
+    io_format = _get(fmt or guess_format(path))
+    if io_format.writer is None:
+        raise ValueError(f"Format {io_format.name} cannot be written")
+    if isinstance(structures, Molecule):
+        structures = [structures]
+    with open(path, "w", encoding="utf-8") as fp:
+        io_format.writer(fp, structures)
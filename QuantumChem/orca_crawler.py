@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.0
+
+Recursive search for ORCA output files in a project tree.
+
+crawl_outputs() walks the tree with os.scandir (one system call per directory,
+file types come for free) and yields the matching files as it finds them, so
+the parser can start while the walk is still going. Features:
+    - include globs on the file name (default "*.out")
+    - exclude globs on file and directory names or on the path relative to
+      the root (e.g. "temp1", "*/scratch/*"); excluded directories are not
+      entered at all
+    - max_depth (0 = only the root directory, None = unlimited)
+    - symlinked directories are followed, but every directory is only visited
+      once (device + inode), so symlink loops cannot hang the walk
+
+Every directory is listed in sorted order: first its files, then its
+subdirectories (depth first).
+
+Usage:
+    for filename in crawl_outputs(".", exclude=["temp1"], max_depth=3):
+        ...
+"""
+
+# * Changelog:
+# * 0.1.0 - Initial release
+
+import os
+import sys
+from fnmatch import fnmatch
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+
+VERSION = "0.1.0"
+
+
+def _matches(name: str, relpath: str, patterns: Sequence[str]) -> bool:
+    return any(fnmatch(name, pat) or fnmatch(relpath, pat) for pat in patterns)
+
+
+def crawl_outputs(
+    root: str = ".",
+    include: Sequence[str] = ("*.out",),
+    exclude: Sequence[str] = (),
+    max_depth: Optional[int] = 0,
+    follow_symlinks: bool = True,
+) -> Iterator[str]:
+    """
+    Yields the paths of all files below root matching include and not exclude.
+    Paths are joined onto root as given ("." gives plain file names, like
+    os.listdir did before).
+    """
+    visited: Set[Tuple[int, int]] = set()
+    #! stack of (directory path, prefix for the yielded paths, depth)
+    stack: List[Tuple[str, str, int]] = [(root, "" if root == "." else root, 0)]
+    while stack:
+        dirpath, prefix, depth = stack.pop()
+        try:
+            stat = os.stat(dirpath)
+        except OSError as err:
+            print("Skipping", dirpath + ":", err, file=sys.stderr)
+            continue
+        if (stat.st_dev, stat.st_ino) in visited:  # * symlink loop or duplicate
+            continue
+        visited.add((stat.st_dev, stat.st_ino))
+
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(dirpath) as entries:
+                for entry in entries:
+                    path = os.path.join(prefix, entry.name)
+                    relpath = os.path.relpath(entry.path, root)
+                    if _matches(entry.name, relpath, exclude):
+                        continue
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        subdirs.append((entry.name, entry.path, path))
+                    elif _matches(entry.name, relpath, include):
+                        files.append(path)
+        except OSError as err:  # * permission denied, vanished, ...
+            print("Skipping", dirpath + ":", err, file=sys.stderr)
+            continue
+
+        yield from sorted(files)
+        if max_depth is None or depth < max_depth:
+            # * reversed, so the alphabetically first directory is popped first
+            for _, subpath, subprefix in sorted(subdirs, reverse=True):
+                stack.append((subpath, subprefix, depth + 1))
+
+
+def main() -> None:
+    root = sys.argv[1] if len(sys.argv) > 1 else "."
+    for filename in crawl_outputs(root, max_depth=None):
+        print(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,133 +11,411 @@ Arguments: basename - file name without the extension;
 """
 
 """
-16.06.2022 
+16.06.2022
 Modified by M. R. J. Dagleish
+
+Version 0.5.4
+
+The grid (orca_vpot input) and the cube are formatted in bulk: a whole block
+of rows is formatted with one %-operation on a preformatted template and
+written in one call, no Python loop over the grid points. The orca_vpot
+output is read chunk-wise by np.loadtxt and its rows are checked.
+Large grids can be split into shards that are evaluated by concurrent
+orca_vpot runs and merged in grid order. Instead of npoints**3, the grid
+can have a target spacing per axis (--resolution) and only the points in a
+van der Waals shell band (--shell) can be evaluated; the other points of the
+cube get a fill value.
+
+Usage:
+    python3 orca_mep.py water 80
+    python3 orca_mep.py water 120 --shards 8 --jobs 8
+    python3 orca_mep.py water --resolution 0.25 --shell 1.0 2.0
+    python3 orca_mep.py water 40 --vpot ./mock_orca_vpot.py
 """
 
 #!/usr/bin/env python
 
+# * Changelog:
+# * 0.5.4 - Shards capped at SHARDS_PER_JOB * jobs and MIN_SHARD_POINTS points each
+# * 0.5.3 - At least 2 points per axis (flat molecules), --extent < 0 rejected
+# * 0.5.2 - --shell checked: INNER < OUTER and at least one point in the band
+# * 0.5.1 - At most one shard per point, shard files removed also on errors,
+# *         --shards < 1 rejected
+# * 0.5.0 - --resolution: per-axis number of points; --shell: only points in a
+# *         vdW shell band are evaluated, the rest is --fill; --extent
+# * 0.4.0 - --shards/--jobs: orca_vpot runs on grid shards in parallel;
+# *         --vpot for another executable (mock_orca_vpot.py); argparse
+# * 0.3.0 - read_vpot parses chunk-wise into a preallocated array and checks
+# *         the number of rows
+# * 0.2.0 - Vectorized grid generation and cube writing
+# * 0.1.0 - read_xyz via mol_io.py, element table from element_data.py
 
-def read_xyz(xyz):
-    atoms, x, y,z  = [], [], [], []
+import argparse
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Optional, Sequence, TextIO
+
+import numpy as np
 
-    with open(xyz) as fp:
-        # Skip the first two lines.
-        next(fp)
-        next(fp)
-        for line in fp:
-            data = line.split()
-            atoms.append(data[0])
-            x.append(float(data[1]))
-            y.append(float(data[2]))
-            z.append(float(data[3]))
+from element_data import atomic_numbers, vdw_radii
+from mol_io import read_molecule
+from orca_out_parser import available_cpus
 
-    return atoms, np.array(x), np.array(y), np.array(z)
+VERSION = "0.5.4"
 
+ANG_TO_AU = 1.0 / 0.5291772083
+EXTENT = 7.0  # * bohr around the molecule
+ORCA_VPOT = "orca_vpot"
+SHELL = (1.0, 2.0)  # * band for --shell, in units of the vdW radii
+FILL = 0.0  # * cube value of points outside the shell (not evaluated)
+SHARDS_PER_JOB = 4  # * more shards than workers only help the load balance
+MIN_SHARD_POINTS = 1000  # * every orca_vpot run reads the .gbw/.scfp again
 
-def read_vpot(vpot):
-    v = list()
+GRID_FORMAT = "%12.6f %12.6f %12.6f\n"
+CUBE_FORMAT = "%14.5e"
+CUBE_VALUES_PER_LINE = 6
+CHUNK_VALUES = 1 << 18  # * values formatted per write call
+VPOT_CHUNK_LINES = 1 << 16  # * lines of the orca_vpot output parsed at once
 
+
+def read_xyz(xyz):
+    # * first structure of the file, read by mol_io.py
+    mol = read_molecule(xyz, "xyz")
+    x, y, z = mol.coordinates.T
+    return mol.symbols.tolist(), x, y, z
+
+
+def read_vpot(
+    vpot: str, expected: Optional[int] = None, chunk_lines: int = VPOT_CHUNK_LINES
+) -> np.ndarray:
+    """
+    Potentials (column 4) of an orca_vpot output. The first line holds the
+    number of points; the values are parsed chunk-wise by np.loadtxt straight
+    into a preallocated array, so the text is never held in memory as a whole.
+    Raises ValueError if the number of rows differs from the header or from
+    expected (e.g. npoints**3).
+    """
     with open(vpot) as fp:
-        next(fp)
-        for line in fp:
-            data = line.split()
-            v.append(float(data[3]))
-
-    return np.array(v)
-
-if __name__ == '__main__':
-    import os
-    import sys
-    import subprocess
-    import numpy as np
-
-    ang_to_au = 1.0 / 0.5291772083
-
-    elements = [None,
-         'H', 'He',
-         'Li', 'Be',
-         'B', 'C', 'N', 'O', 'F', 'Ne',
-         'Na', 'Mg',
-         'Al', 'Si', 'P', 'S', 'Cl', 'Ar',
-         'K', 'Ca',
-         'Sc', 'Ti', 'V', 'Cr', 'Mn', 'Fe', 'Co', 'Ni', 'Cu', 'Zn',
-         'Ga', 'Ge', 'As', 'Se', 'Br', 'Kr',
-         'Rb', 'Sr',
-         'Y', 'Zr', 'Nb', 'Mo', 'Tc', 'Ru', 'Rh', 'Pd', 'Ag', 'Cd',
-         'In', 'Sn', 'Sb', 'Te', 'I', 'Xe',
-         'Cs', 'Ba',
-         'La', 'Ce', 'Pr', 'Nd', 'Pm', 'Sm', 'Eu', 'Gd', 'Tb', 'Dy', 'Ho', 'Er', 'Tm', 'Yb',
-         'Lu', 'Hf', 'Ta', 'W', 'Re', 'Os', 'Ir', 'Pt', 'Au', 'Hg',
-         'Tl', 'Pb', 'Bi', 'Po', 'At', 'Rn',
-         'Fr', 'Ra',
-         'Ac', 'Th', 'Pa', 'U', 'Np', 'Pu', 'Am', 'Cm', 'Bk', 'Cf', 'Es', 'Fm', 'Md', 'No',
-         'Lr', 'Rf', 'Db', 'Sg', 'Bh', 'Hs', 'Mt', 'Ds', 'Rg', 'Cn', 'Nh', 'Fl', 'Mc', 'Lv', 'Ts', 'Og']
-
-    basename = sys.argv[1]
-    xyz = basename + '.xyz'
+        header = fp.readline().split()
+        try:
+            no_points = int(header[0])
+        except (IndexError, ValueError):
+            raise ValueError(f"{vpot}: no number of points in the first line") from None
+        if expected is not None and no_points != expected:
+            raise ValueError(f"{vpot}: {no_points} points, expected {expected}")
+        v = np.empty(no_points)
+        filled = 0
+        while True:
+            lines = list(islice(fp, chunk_lines))
+            if not lines:
+                break
+            values = np.loadtxt(lines, usecols=3, ndmin=1)
+            if filled + len(values) > no_points:
+                raise ValueError(f"{vpot}: more than {no_points} rows")
+            v[filled : filled + len(values)] = values
+            filled += len(values)
+
+    if filled != no_points:
+        raise ValueError(f"{vpot}: {filled} rows, expected {no_points}")
+    return v
+
+
+def grid_axes(
+    coords_au: np.ndarray,
+    npoints: Optional[int] = None,
+    extent: float = EXTENT,
+    resolution: Optional[float] = None,
+) -> List[np.ndarray]:
+    """
+    Grid coordinates (bohr) along x, y and z: the molecule plus extent.
+    Either npoints per axis (cubic grid) or a target spacing resolution (bohr):
+    every axis then gets as many points as its length needs, so elongated
+    molecules do not waste points along their short axes.
+    """
+    lower = coords_au.min(axis=0) - extent
+    upper = coords_au.max(axis=0) + extent
+    #! flat molecule without extent: one step around the plane, no zero step
+    flat = upper - lower < 1e-6
+    half_step = 0.5 * (resolution if resolution is not None else 1.0)
+    lower[flat] -= half_step
+    upper[flat] += half_step
+    if resolution is not None:
+        counts = np.ceil((upper - lower) / resolution).astype(int) + 1
+    else:
+        counts = np.full(3, npoints)
+    counts = np.maximum(counts, 2)  # * a cube axis needs a step
+    return [np.linspace(lower[i], upper[i], counts[i], True) for i in range(3)]
+
+
+def grid_points(axes: Sequence[np.ndarray]) -> np.ndarray:
+    """All grid points as (n, 3), x slowest and z fastest (cube order)."""
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return np.stack([axis.ravel() for axis in mesh], axis=1)
+
+
+def shell_mask(
+    axes: Sequence[np.ndarray],
+    coords_au: np.ndarray,
+    radii_au: np.ndarray,
+    inner: float = SHELL[0],
+    outer: float = SHELL[1],
+) -> np.ndarray:
+    """
+    Grid points (boolean (nx, ny, nz)) in the van der Waals shell band: the
+    nearest atom, in units of its vdW radius, is between inner and outer.
+    The squared distances are built per axis and broadcast over the grid.
+    """
+    shape = tuple(len(axis) for axis in axes)
+    nearest = np.full(shape, np.inf)
+    for position, radius in zip(coords_au, radii_au):
+        dx2, dy2, dz2 = ((axis - x) ** 2 for axis, x in zip(axes, position))
+        dist2 = dx2[:, None, None] + dy2[None, :, None] + dz2[None, None, :]
+        np.minimum(nearest, dist2 / radius**2, out=nearest)
+    return (nearest >= inner**2) & (nearest <= outer**2)
+
+
+def write_blocks(fp: TextIO, values: np.ndarray, row_format: str) -> None:
+    """
+    Writes the rows of a 2D array with row_format (one %-field per column).
+    Blocks of rows are formatted with a single %-operation each.
+    """
+    rows_per_block = max(1, CHUNK_VALUES // max(1, values.shape[1]))
+    block_format = row_format * rows_per_block
+    for start in range(0, len(values), rows_per_block):
+        block = values[start : start + rows_per_block]
+        if len(block) < rows_per_block:
+            block_format = row_format * len(block)
+        fp.write(block_format % tuple(block.ravel().tolist()))
+
+
+def cube_row_format(npoints_z: int) -> str:
+    """Template of one z-row of a cube: 6 values per line, new line at the end."""
+    fields = [CUBE_FORMAT] * npoints_z
+    lines = [
+        "".join(fields[i : i + CUBE_VALUES_PER_LINE])
+        for i in range(0, npoints_z, CUBE_VALUES_PER_LINE)
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def write_points(path: str, points: np.ndarray) -> None:
+    """orca_vpot input: number of points, then one point (bohr) per line."""
+    with open(path, "w") as fp:
+        fp.write("{0:d}\n".format(len(points)))
+        write_blocks(fp, points, GRID_FORMAT)
+
+
+def write_grid(path: str, axes: Sequence[np.ndarray]) -> None:
+    write_points(path, grid_points(axes))
+
+
+def write_cube(
+    path: str,
+    title: str,
+    atoms: Sequence[str],
+    coords_au: np.ndarray,
+    axes: Sequence[np.ndarray],
+    values: np.ndarray,
+) -> None:
+    """Gaussian cube of values on the grid of axes (x slowest, z fastest)."""
+    shape = tuple(len(axis) for axis in axes)
+    values = np.reshape(values, shape)
+    with open(path, "w") as fp:
+        fp.write("Generated with ORCA\n")
+        fp.write(title + "\n")
+        fp.write(
+            "{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n".format(
+                len(atoms), axes[0][0], axes[1][0], axes[2][0]
+            )
+        )
+        for i, axis in enumerate(axes):
+            step = np.zeros(3)
+            step[i] = (axis[-1] - axis[0]) / float(len(axis) - 1)
+            fp.write("{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n".format(len(axis), *step))
+        atom_block = np.column_stack(
+            (atomic_numbers(atoms), np.zeros(len(atoms)), coords_au)
+        )
+        write_blocks(fp, atom_block, "%5d%12.6f%12.6f%12.6f%12.6f\n")
+        write_blocks(fp, values.reshape(-1, shape[2]), cube_row_format(shape[2]))
+
+
+def run_vpot(
+    vpot_exe: str, basename: str, inp: str, out: str, expected: int
+) -> np.ndarray:
+    """One orca_vpot run on the grid file inp, returns its potentials."""
+    subprocess.check_call([vpot_exe, basename + ".gbw", basename + ".scfp", inp, out])
+    return read_vpot(out, expected=expected)
+
+
+def evaluate_vpot(
+    basename: str,
+    points: np.ndarray,
+    shards: int = 1,
+    jobs: int = 0,
+    vpot_exe: str = ORCA_VPOT,
+) -> np.ndarray:
+    """
+    Potentials at points (bohr). With shards > 1 the points are split into
+    contiguous shards (<basename>_mep.<i>.inp/.out), orca_vpot runs on them in
+    a pool of jobs workers (jobs <= 0: all cores) and the results are merged
+    in grid order. There are at most SHARDS_PER_JOB * jobs shards with at least
+    MIN_SHARD_POINTS points each; the shard files are removed afterwards, also
+    if a run fails.
+    """
+    if jobs <= 0:
+        jobs = available_cpus()
+    shards = min(
+        shards, SHARDS_PER_JOB * jobs, max(1, len(points) // MIN_SHARD_POINTS)
+    )
+    if shards <= 1:
+        inp, out = basename + "_mep.inp", basename + "_mep.out"
+        write_points(inp, points)
+        return run_vpot(vpot_exe, basename, inp, out, len(points))
+
+    parts = np.array_split(points, shards)
+    names = [
+        (f"{basename}_mep.{i}.inp", f"{basename}_mep.{i}.out")
+        for i in range(len(parts))
+    ]
+    try:
+        for (inp, _), part in zip(names, parts):
+            write_points(inp, part)
+
+        jobs = min(jobs, len(parts))
+        vpot = np.empty(len(points))
+        offsets = np.cumsum([0] + [len(part) for part in parts])
+        #! threads are enough: the work is done in the orca_vpot processes
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = pool.map(
+                lambda i: run_vpot(vpot_exe, basename, *names[i], len(parts[i])),
+                range(len(parts)),
+            )
+            for i, values in enumerate(results):
+                vpot[offsets[i] : offsets[i + 1]] = values
+    finally:
+        for name in (name for pair in names for name in pair):
+            if os.path.exists(name):
+                os.remove(name)
+    return vpot
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="orca_mep.py",
+        description=f"MEP cube from ORCA with orca_vpot. Version {VERSION}",
+    )
+    parser.add_argument(
+        "basename", help="name of the .gbw/.scfp/.xyz files without extension"
+    )
+    parser.add_argument(
+        "npoints",
+        type=int,
+        nargs="?",
+        help="number of grid points per side (80 is fine)",
+    )
+    parser.add_argument(
+        "--resolution",
+        type=float,
+        help="grid spacing in bohr, per-axis number of points (instead of npoints)",
+    )
+    parser.add_argument(
+        "--extent",
+        type=float,
+        default=EXTENT,
+        help=f"bohr around the molecule (default: {EXTENT})",
+    )
+    parser.add_argument(
+        "--shell",
+        type=float,
+        nargs=2,
+        metavar=("INNER", "OUTER"),
+        help="only evaluate points between INNER and OUTER times the vdW radii "
+        f"of the nearest atom (e.g. {SHELL[0]} {SHELL[1]})",
+    )
+    parser.add_argument(
+        "--fill",
+        type=float,
+        default=FILL,
+        help=f"cube value of the points outside --shell (default: {FILL})",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=1,
+        help="split the grid into N orca_vpot runs (default: 1; at most "
+        f"{SHARDS_PER_JOB} per job and one per {MIN_SHARD_POINTS} points)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="concurrent orca_vpot runs for --shards (default: all cores)",
+    )
+    parser.add_argument(
+        "--vpot",
+        default=ORCA_VPOT,
+        help="orca_vpot executable (e.g. mock_orca_vpot.py for tests)",
+    )
+    args = parser.parse_args(argv)
+    basename, npoints = args.basename, args.npoints
+    xyz = basename + ".xyz"
 
     if not os.path.isfile(xyz):
-        sys.exit('Could not find the .xyz. To quickly generate one for '
-                 'your molecule run: echo 11 | orca_plot {}.gbw -i.'.format(basename))
+        sys.exit(
+            "Could not find the .xyz. To quickly generate one for "
+            "your molecule run: echo 11 | orca_plot {}.gbw -i.".format(basename)
+        )
+    if args.resolution is not None:
+        if args.resolution <= 0.0:
+            sys.exit("Invalid resolution: {}".format(args.resolution))
+    elif npoints is None or npoints < 2:
+        sys.exit("Invalid number of points: {}".format(npoints))
+    if args.extent < 0.0:
+        sys.exit("Invalid extent: {}".format(args.extent))
+    if args.shell and args.shell[0] >= args.shell[1]:
+        sys.exit("Invalid --shell: INNER must be smaller than OUTER")
+    if args.shards < 1:
+        sys.exit("Invalid number of shards: {}".format(args.shards))
 
     atoms, x, y, z = read_xyz(xyz)
+    coords_au = np.column_stack((x, y, z)) * ANG_TO_AU
 
+    axes = grid_axes(coords_au, npoints, args.extent, args.resolution)
+    points = grid_points(axes)
+    vpot = np.full(len(points), args.fill)
+    if args.shell:
+        radii_au = vdw_radii(atoms) * ANG_TO_AU
+        selected = shell_mask(axes, coords_au, radii_au, *args.shell).ravel()
+        if not selected.any():
+            sys.exit("No grid points in the --shell band {} {}".format(*args.shell))
+        points = points[selected]
+    else:
+        selected = slice(None)
+    print(
+        "  Grid {} x {} x {}: {} of {} points evaluated".format(
+            *(len(axis) for axis in axes), len(points), len(vpot)
+        )
+    )
     try:
-        npoints = int(sys.argv[2])
-    except ValueError:
-        sys.exit('Invalid number of points: {}'.format(sys.argv[2]))
-
-    natoms = len(atoms)
-
-    extent = 7.0
-    xmin = x.min() * ang_to_au - extent
-    xmax = x.max() * ang_to_au + extent
-    ymin = y.min() * ang_to_au - extent
-    ymax = y.max() * ang_to_au + extent
-    zmin = z.min() * ang_to_au - extent
-    zmax = z.max() * ang_to_au + extent
-
-    with open(basename + '_mep.inp', 'w') as fp:
-        fp.write('{0:d}\n'.format(npoints**3))
-        for ix in np.linspace(xmin, xmax, npoints, True):
-            for iy in np.linspace(ymin, ymax, npoints, True):
-                for iz in np.linspace(zmin, zmax, npoints, True):
-                    fp.write('{0:12.6f} {1:12.6f} {2:12.6f}\n'.format(ix, iy, iz))
-
-    subprocess.check_call(['orca_vpot', basename + '.gbw', basename + '.scfp',
-            basename + '_mep.inp', basename + '_mep.out'])
-
-    vpot = read_vpot(basename + '_mep.out')
-
-    with open(basename + '_mep.cube', 'w') as fp:
-        fp.write('Generated with ORCA\n')
-        fp.write('Electrostatic potential for ' + basename + '\n')
-        fp.write('{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n'.format(
-            len(atoms), xmin, ymin, zmin))
-        fp.write('{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n'.format(
-            npoints, (xmax - xmin) / float(npoints - 1), 0.0, 0.0))
-        fp.write('{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n'.format(
-            npoints, 0.0, (ymax - ymin) / float(npoints - 1), 0.0))
-        fp.write('{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}\n'.format(
-            npoints, 0.0, 0.0, (zmax - zmin) / float(npoints - 1)))
-        for i, atom in enumerate(atoms):
-            index = elements.index(atom)
-            fp.write('{0:5d}{1:12.6f}{2:12.6f}{3:12.6f}{4:12.6f}\n'.format(
-                index, 0.0, x[i] * ang_to_au, y[i] * ang_to_au, z[i] * ang_to_au))
-
-        m = 0
-        n = 0
-        vpot = np.reshape(vpot, (npoints, npoints, npoints))
-        for ix in range(npoints):
-            for iy in range(npoints):
-                for iz in range(npoints):
-                    fp.write('{0:14.5e}'.format(vpot[ix][iy][iz]))
-                    m += 1
-                    n += 1
-                    if (n > 5):
-                        fp.write('\n')
-                        n = 0
-                if n != 0:
-                    fp.write('\n')
-                    n = 0
\ No newline at end of file
+        vpot[selected] = evaluate_vpot(
+            basename, points, args.shards, args.jobs, args.vpot
+        )
+    except (OSError, subprocess.CalledProcessError) as err:
+        sys.exit("orca_vpot failed: {}".format(err))
+    except ValueError as err:
+        sys.exit("Invalid orca_vpot output: {}".format(err))
+    write_cube(
+        basename + "_mep.cube",
+        "Electrostatic potential for " + basename,
+        atoms,
+        coords_au,
+        axes,
+        vpot,
+    )
+
+
+if __name__ == "__main__":
+    main()
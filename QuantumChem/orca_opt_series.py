@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.0
+
+Collects the progress of an ORCA geometry optimisation into NumPy arrays with
+a single read of the output file:
+    - energy change, RMS/MAX gradient and RMS/MAX step of every
+      |Geometry convergence| table (one row per optimisation cycle)
+    - the tolerances of these items (taken from the last table)
+    - every FINAL SINGLE POINT ENERGY
+
+Replaces the grep calls of orcajobcheck.py (-plotgrad, -plotstep, -plotenergy,
+-grad), which read the file once per quantity. The series can be written to
+CSV or NPZ for plotting elsewhere.
+
+Usage:
+    python3 orca_opt_series.py opt.out            # * writes opt_opt.csv
+    python3 orca_opt_series.py opt.out --npz      # * writes opt_opt.npz
+
+    from orca_opt_series import extract_opt_series
+    series = extract_opt_series("opt.out")
+    series.rms_gradient, series.energies
+"""
+
+# * Changelog:
+# * 0.1.0 - Initial release
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+VERSION = "0.1.0"
+
+#! |Geometry convergence| rows, in the order of the columns of OptSeries.table
+CONV_ITEMS = ("Energy change", "RMS gradient", "MAX gradient", "RMS step", "MAX step")
+
+CSV_HEADER = (
+    "cycle",
+    "energy",
+    "energy_change",
+    "rms_gradient",
+    "max_gradient",
+    "rms_step",
+    "max_step",
+)
+
+
+@dataclass
+class OptSeries:
+    """Optimisation progress of one output. Missing values are NaN."""
+
+    filename: str
+    #! shape (n_cycles, 5), columns as in CONV_ITEMS
+    table: np.ndarray
+    #! tolerance per CONV_ITEMS entry (NaN if never printed)
+    tolerances: np.ndarray
+    #! every FINAL SINGLE POINT ENERGY (Eh), including a final evaluation
+    energies: np.ndarray
+
+    @property
+    def cycles(self) -> np.ndarray:
+        return np.arange(1, len(self.table) + 1)
+
+    @property
+    def energy_change(self) -> np.ndarray:
+        return self.table[:, 0]
+
+    @property
+    def rms_gradient(self) -> np.ndarray:
+        return self.table[:, 1]
+
+    @property
+    def max_gradient(self) -> np.ndarray:
+        return self.table[:, 2]
+
+    @property
+    def rms_step(self) -> np.ndarray:
+        return self.table[:, 3]
+
+    @property
+    def max_step(self) -> np.ndarray:
+        return self.table[:, 4]
+
+    def tolerance(self, item: str) -> float:
+        """Tolerance of a CONV_ITEMS entry, e.g. tolerance("RMS gradient")."""
+        return float(self.tolerances[CONV_ITEMS.index(item)])
+
+    def cycle_energies(self) -> np.ndarray:
+        """Energies of the optimisation cycles, NaN padded to len(cycles)."""
+        energies = np.full(len(self.table), np.nan)
+        nvalues = min(len(self.table), len(self.energies))
+        energies[:nvalues] = self.energies[:nvalues]
+        return energies
+
+    def to_csv(self, filename: str) -> None:
+        """One row per cycle: cycle, energy and the convergence items."""
+        data = np.column_stack((self.cycles, self.cycle_energies(), self.table))
+        np.savetxt(
+            filename,
+            data,
+            delimiter=",",
+            header=",".join(CSV_HEADER),
+            comments="",
+            fmt=["%d"] + ["%.10f"] * (data.shape[1] - 1),
+        )
+
+    def to_npz(self, filename: str) -> None:
+        np.savez(
+            filename,
+            cycles=self.cycles,
+            table=self.table,
+            tolerances=self.tolerances,
+            energies=self.energies,
+            items=np.array(CONV_ITEMS),
+        )
+
+
+def extract_opt_series(filename: str) -> OptSeries:
+    """Reads the output once and returns its OptSeries."""
+    rows: List[List[float]] = []
+    energies: List[float] = []
+    tolerances: Dict[str, float] = {}
+    row = None  # * the row of the convergence table being read
+    # * errors="ignore" works around the odd encoding issue in ORCA outputs
+    with open(filename, errors="ignore") as fp:
+        for line in fp:
+            if row is not None:
+                parts = line.split()
+                if not parts:
+                    rows.append(row)
+                    row = None
+                    continue
+                item = " ".join(parts[:2])
+                if item in CONV_ITEMS and len(parts) >= 4:
+                    row[CONV_ITEMS.index(item)] = float(parts[2])
+                    tolerances[item] = float(parts[3])
+            elif "|Geometry convergence|" in line:
+                row = [np.nan] * len(CONV_ITEMS)
+            elif "FINAL SINGLE POINT ENERGY" in line:
+                energies.append(float(line.split()[4]))
+    if row is not None:  # * table still being written
+        rows.append(row)
+    return OptSeries(
+        filename=filename,
+        table=np.array(rows, dtype=float).reshape(-1, len(CONV_ITEMS)),
+        tolerances=np.array([tolerances.get(item, np.nan) for item in CONV_ITEMS]),
+        energies=np.array(energies, dtype=float),
+    )
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: orca_opt_series.py file.out [--npz]")
+        sys.exit(1)
+    filename = sys.argv[1]
+    series = extract_opt_series(filename)
+    basename = os.path.splitext(filename)[0] + "_opt"
+    if "--npz" in sys.argv:
+        series.to_npz(basename + ".npz")
+        print("Written", basename + ".npz")
+    else:
+        series.to_csv(basename + ".csv")
+        print("Written", basename + ".csv")
+    print(len(series.table), "cycles,", len(series.energies), "energies")
+
+
+if __name__ == "__main__":
+    main()
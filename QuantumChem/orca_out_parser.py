@@ -0,0 +1,1062 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.7.0
+
+Single-pass streaming parser for ORCA output files (.out).
+
+Every line of the output is read exactly once, front to back, and handed to
+the handlers registered in OrcaOutputParser.HANDLERS (substring -> method)
+plus the section that is currently being captured (input block, geometry,
+orbital energies, frequencies, ...). All handler substrings are merged into
+one precompiled KeywordMatcher, so a line costs a single regex search no
+matter how many handlers, error signatures or functionals there are. Things
+the old orcajobcheck.py picked up with a second, backwards read are simply
+overwritten on every occurrence, so the last occurrence wins. Error messages
+are only searched for in the last TAIL_LINES lines, like before.
+
+Usage:
+    from orca_out_parser import parse_orca_output
+    res = parse_orca_output("job.out")
+    print(res.job_type, res.run_complete, res.scf_energy)
+
+    # * many files in 4 worker processes, results in input order
+    for res in parse_orca_outputs(filelist, jobs=4):
+        ...
+
+    # * running job: only the bytes appended since the last poll() are parsed
+    follower = OutputFollower("job.out")
+    follower.poll()  # * call again later, only the new lines are parsed
+    print(follower.result().scf_iteration, follower.result().rms_gradient)
+"""
+
+# * Changelog:
+# * 0.7.0 - frequencies of the last VIBRATIONAL FREQUENCIES block in OrcaJobResult
+# * 0.6.0 - parse_orca_outputs streams from generators and passes cached results through
+# * 0.5.0 - KeywordMatcher (one trie regex) for handlers, error signatures, functionals
+# * 0.4.0 - parse_time of every parsed file in OrcaJobResult
+# * 0.3.0 - Added OutputFollower (incremental tail parsing) and live SCF/opt progress
+# * 0.2.0 - Added parse_orca_outputs (process pool for directory scans)
+# * 0.1.0 - Initial release (replaces the forward + reverse reads of orcajobcheck.py)
+
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import (
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+VERSION = "0.7.0"
+
+#! Only the last TAIL_LINES lines are searched for error messages
+TAIL_LINES = 60
+
+PARSE_WINDOW = 8  # * files queued per worker in parse_orca_outputs
+
+#! Order matters: the last functional found in the simple input wins (pbe -> pbe0)
+FUNCTIONALS = (
+    "b3lyp",
+    "bp",
+    "pbe",
+    "tpss",
+    "tpssh",
+    "pbe0",
+    "bp86",
+    "blyp",
+    "lda",
+    "bhlyp",
+    "b2plyp",
+    "cam-b3lyp",
+    "m06-2x",
+    "pw6b95",
+)
+
+OPT_JOBS = ("opt", "optts", "optfreq", "opttsfreq")
+FREQ_JOBS = ("freqsp", "optfreq", "opttsfreq")
+
+#! |Geometry convergence| table rows -> OrcaJobResult attribute
+GEOM_CONV_ITEMS = {
+    "Energy change": "energy_change",
+    "RMS gradient": "rms_gradient",
+    "MAX gradient": "max_gradient",
+    "RMS step": "rms_step",
+    "MAX step": "max_step",
+}
+
+LINE = "<line>"  # * ErrorSignature.message placeholder for the line itself
+
+
+class ErrorSignature(NamedTuple):
+    """Message ORCA prints at the end of a crashed job."""
+
+    text: str
+    early: bool = False  # * crashed before the actual calculation started
+    message: Optional[str] = None  # * appended to OrcaJobResult.errors
+    flag: Optional[str] = None  # * OrcaJobResult attribute set to True
+
+
+ERROR_SIGNATURES = (
+    ErrorSignature("ERROR: Unknown identifier", True, LINE),
+    ErrorSignature("Error (ORCA/TRAFO/RI-GIAO):", False, LINE),
+    ErrorSignature("Zero distance between atoms", True),
+    ErrorSignature("Cannot open input file:", True),
+    ErrorSignature("You must have a", True),
+    ErrorSignature("INPUT ERROR", True),
+    ErrorSignature(
+        "ERROR CODE RETURNED FROM CP-SCF PROGRAM", False, None, "cpscf_error"
+    ),
+    ErrorSignature("ABORTING THE RUN", True),
+    ErrorSignature("Invalid assignment in", True),
+    ErrorSignature("Aborting the run", False),
+    ErrorSignature("Skipping actual calculation", True),
+    ErrorSignature("Error : multiplicity", True),
+    ErrorSignature("Unrecognized symbol in", True, LINE),
+    ErrorSignature("Basis not recognized", True, LINE),
+    ErrorSignature("Requested ECP not available", True, LINE),
+    ErrorSignature(
+        "Element name/number, dummy atom or point charge expected in COORDS", True
+    ),
+    ErrorSignature("FATAL ERROR ENCOUNTERED", True),
+    ErrorSignature("There is no basis function on atom", True),
+    ErrorSignature("ORCA finished by error termination", False, LINE),
+    ErrorSignature("An error has occured in the SCF module", False, None, "scf_error"),
+    ErrorSignature(
+        "An error has occured in the CASSCF module", False, "CASSCF module failed"
+    ),
+    ErrorSignature(
+        "ORCA finished by error termination in CASSCF", False, "CASSCF module failed"
+    ),
+    ErrorSignature("mpirun has exited due to process", False),
+    ErrorSignature("mpirun noticed that process rank 0", False),
+    ErrorSignature("Job terminated from outer", False),
+    ErrorSignature("CANNOT OPEN FILE", True),
+    ErrorSignature(
+        "Error: XYZ File reading requested",
+        True,
+        "XYZ file error problem",
+        "xyz_file_error",
+    ),
+    ErrorSignature(
+        "!!!               Filename:", True, "XYZ file error problem", "xyz_file_error"
+    ),
+    ErrorSignature("Unknown identifier in", True),
+    ErrorSignature("ERROR: expect a", True),
+    ErrorSignature("ERROR: found a coordinate defintion", True),
+    ErrorSignature(
+        "Diagonalization failure because of NANs in input matrix",
+        False,
+        None,
+        "diag_error",
+    ),
+    ErrorSignature("ERROR       : GSTEP Program returns an error", False),
+    ErrorSignature(
+        "This wavefunction IS NOT CONVERGED!",
+        False,
+        "SCF did not converge",
+        "scf_failed",
+    ),
+    ErrorSignature(
+        "Error (ORCA_SCFGRAD): cannot find the xc-energy file:",
+        False,
+        "SCF did not converge",
+        "scf_failed",
+    ),
+)
+
+
+def _trie_pattern(keywords: Sequence[str]) -> str:
+    """
+    Regex matching any of the keywords, with common prefixes merged
+    (["SCF CONVERGED", "SCF NOT"] -> "SCF\\ (?:CONVERGED|NOT)"). Python's re
+    module has no Aho-Corasick, but a trie shaped pattern comes close: at each
+    position of the line only the branches for the next character are tried.
+    """
+    trie: Dict[str, dict] = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}  # * end of a keyword
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        # * greedy, so the longest keyword at a position is matched
+        return "(?:" + body + ")?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Finds which of many keywords (plain substrings) a line contains.
+
+    search() is a single precompiled regex search and is used to skip the vast
+    majority of lines. matches() returns the indices of all contained keywords
+    in keyword order, also overlapping ones ("pbe" and "pbe0").
+    """
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = tuple(dict.fromkeys(keywords))  # * unique, order kept
+        pattern = _trie_pattern(self.keywords)
+        self.search = re.compile(pattern).search
+        #! zero width lookahead: finditer tries every position of the line
+        self._finditer = re.compile("(?=(" + pattern + "))").finditer
+        index = {keyword: idx for idx, keyword in enumerate(self.keywords)}
+        #! longest keyword at a position -> all keywords that are a prefix of it
+        self._prefixes = {
+            keyword: [idx for other, idx in index.items() if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def matches(self, line: str) -> List[int]:
+        first = self.search(line)
+        if first is None:
+            return []
+        found = set()
+        for match in self._finditer(line, first.start()):
+            found.update(self._prefixes[match.group(1)])
+        return sorted(found)
+
+
+FUNCTIONAL_MATCHER = KeywordMatcher(FUNCTIONALS)
+
+#! searched in the last TAIL_LINES lines: normal termination, run time, errors
+TERMINATED = "ORCA TERMINATED NORMALLY"
+RUN_TIME = "TOTAL RUN TIME:"
+TAIL_MATCHER = KeywordMatcher(
+    (TERMINATED, RUN_TIME) + tuple(sig.text for sig in ERROR_SIGNATURES)
+)
+SIGNATURES_BY_TEXT: Dict[str, List[ErrorSignature]] = {}
+for _sig in ERROR_SIGNATURES:
+    SIGNATURES_BY_TEXT.setdefault(_sig.text, []).append(_sig)
+
+
+@dataclass
+class OrcaJobResult:
+    """Everything orcajobcheck.py knows about one ORCA output file."""
+
+    filename: str
+    # * program and input
+    version: Optional[str] = None
+    parallel_procs: Optional[str] = None
+    input_line: Optional[str] = None
+    job_type: Optional[str] = (
+        None  # * sp, freqsp, opt, optts, optfreq, opttsfreq, md, scan
+    )
+    functional: str = "unknown"
+    scf_method: Optional[str] = None
+    scf_type: Optional[str] = None  # * RHF, UHF, ROHF
+    dft: bool = False
+    semiempirical: bool = False
+    engrad: bool = False
+    noiter: bool = False
+    moread: bool = False
+    autostart: bool = False
+    nofrozencore: bool = False
+    post_hf: bool = False
+    post_hf_method: Optional[str] = None  # * CC, QCI, MP2
+    extrapolate: bool = False
+    casscf: bool = False
+    new_job: bool = False
+    broken_sym: bool = False
+    bs_ms: Optional[float] = None
+    # * molecule
+    charge: Optional[str] = None
+    mult: Optional[int] = None
+    spin: Optional[float] = None
+    num_electrons: Optional[str] = None
+    num_atoms: Optional[int] = None
+    basis_functions: Optional[str] = None
+    nuc_repulsion: Optional[float] = None
+    input_geometry: List[str] = field(default_factory=list)
+    last_geometry: List[str] = field(default_factory=list)
+    # * termination and errors
+    run_complete: bool = False
+    run_time: List[str] = field(default_factory=list)
+    orca_crash: bool = False
+    early_crash: bool = False
+    errors: List[str] = field(default_factory=list)
+    xyz_file_error: bool = False
+    cpscf_error: bool = False
+    scf_error: bool = False
+    scf_failed: bool = False
+    diag_error: bool = False
+    # * SCF
+    scf_converged: Optional[bool] = None
+    scf_cycles: Optional[int] = None
+    scf_unconverged_cycles: Optional[int] = None
+    scf_almost_converged: bool = False
+    scf_still_running: bool = False
+    scf_iteration: Optional[int] = None  # * last iteration of the current SCF
+    scf_iter_energy: Optional[float] = None
+    scf_delta_e: Optional[float] = None
+    scf_energy: Optional[float] = None  # * last FINAL SINGLE POINT ENERGY
+    pure_scf_energy: Optional[float] = None
+    homo_lumo_gap: Optional[float] = None  # * alpha, in eV
+    s2_value: Optional[str] = None
+    ideal_s2_value: Optional[str] = None
+    integrated_electrons: Optional[str] = None
+    bs_energy: Optional[float] = None
+    hs_energy: Optional[float] = None
+    # * post-HF
+    correlated_electrons: Optional[str] = None
+    frozen_electrons: Optional[str] = None
+    ref_energy: Optional[float] = None
+    corr_energy: Optional[float] = None
+    extrap_scf_energy: Optional[float] = None
+    extrap_corr_energy: Optional[float] = None
+    basis_sets: List[str] = field(default_factory=list)
+    # * CASSCF
+    casscf_converged: Optional[bool] = None
+    last_macro_iter: Optional[str] = None
+    nevpt2_corr_energy: Optional[float] = None
+    # * geometry optimisation
+    opt_job: bool = False
+    opt_converged: bool = False
+    opt_not_converged: bool = False
+    opt_cycle: Optional[int] = None
+    opt_energy: Optional[float] = None
+    final_opt_energy: Optional[float] = None
+    geom_conv_table: List[str] = field(default_factory=list)
+    energy_change: Optional[float] = None  # * from the last convergence table
+    rms_gradient: Optional[float] = None
+    max_gradient: Optional[float] = None
+    rms_step: Optional[float] = None
+    max_step: Optional[float] = None
+    # * frequencies and thermochemistry
+    freq_job: bool = False
+    freq_section: Optional[str] = None  # * done, notyetdone, notpresent
+    imaginary_modes: List[float] = field(default_factory=list)
+    frequencies: List[float] = field(default_factory=list)  # * cm**-1, last block
+    lowest_vib: Optional[float] = None
+    linear: bool = False
+    temperature: Optional[float] = None
+    zpe_corr: Optional[float] = None
+    enthalpy_corr: Optional[float] = None
+    entropy_corr: Optional[float] = None
+    gibbs_corr: Optional[float] = None
+    # * relaxed surface scan
+    scan_coord_type: Optional[str] = None  # * Bond, Angle, Dihedral
+    scan_atoms: List[str] = field(default_factory=list)
+    scan_steps: Optional[int] = None
+    scan_start: Optional[float] = None
+    scan_end: Optional[float] = None
+    scan_change: Optional[float] = None
+    scan_step_numbers: List[str] = field(default_factory=list)
+    scan_energies: List[float] = field(default_factory=list)
+    # * bookkeeping
+    parse_time: Optional[float] = None  # * seconds, set by parse_orca_output
+
+
+def classify_input_line(res: OrcaJobResult, inputline: str) -> None:
+    """Sets the job type and method flags from the (lower case) simple input."""
+    found = FUNCTIONAL_MATCHER.matches(inputline)
+    if found:
+        res.functional = FUNCTIONAL_MATCHER.keywords[found[-1]]
+    res.noiter = "noiter" in inputline
+    res.moread = "moread" in inputline
+    res.nofrozencore = "nofrozencore" in inputline
+    res.extrapolate = "extrapolate" in inputline
+    for keyword, method in (("ccsd", "CC"), ("qcisd", "QCI"), ("mp2", "MP2")):
+        if keyword in inputline:
+            res.post_hf = True
+            res.post_hf_method = method
+
+    if " optts " in inputline or " optts\n" in inputline:
+        res.job_type = "optts"
+        if " freq" in inputline or " numfreq" in inputline:
+            res.job_type = "opttsfreq"
+    elif " opt" in inputline or " tightopt" in inputline or "copt" in inputline:
+        res.job_type = "opt"
+        if " freq" in inputline or " numfreq" in inputline:
+            res.job_type = "optfreq"
+    elif " md " in inputline:
+        res.job_type = "md"
+    elif " freq " in inputline:
+        res.job_type = "freqsp"
+    elif " engrad " in inputline:
+        res.job_type = "sp"
+        res.engrad = True
+    else:
+        res.job_type = "sp"
+
+
+class OrcaOutputParser:
+    """Streaming parser: feed() every line of an ORCA output once, then result()."""
+
+    #! substring -> handler method, all merged into MATCHER
+    HANDLERS: Tuple[Tuple[str, str], ...] = (
+        ("Program Version", "_on_version"),
+        ("WARNING: The NDO methods cannot have", "_on_ndo_warning"),
+        ("INPUT FILE", "_on_input_file"),
+        ("Checking for AutoStart:", "_on_autostart"),
+        ("# of contracted basis functions", "_on_contracted_bf"),
+        ("Number of basis functions", "_on_number_bf"),
+        ("parallel MPI-processes", "_on_mpi_procs"),
+        ("SCF SETTINGS", "_on_scf_settings"),
+        (" Hartree-Fock type      HFTyp", "_on_hftyp"),
+        (" Total Charge           Charge", "_on_charge"),
+        (" Multiplicity           Mult            ....", "_on_mult"),
+        ("Number of Electrons    NEL             ....", "_on_nel"),
+        ("Nuclear Repulsion      ENuc", "_on_enuc"),
+        ("CARTESIAN COORDINATES (ANGSTROEM)", "_on_cartesian"),
+        ("SCF ITERATIONS", "_on_scf_iterations"),
+        ("SCF CONVERGED AFTER", "_on_scf_converged"),
+        ("SCF NOT CONVERGED AFTER", "_on_scf_not_converged"),
+        (
+            "The wavefunction IS NOT YET CONVERGED! It shows however signs of",
+            "_on_scf_almost_converged",
+        ),
+        ("Total Energy       :", "_on_total_energy"),
+        ("FINAL SINGLE POINT ENERGY", "_on_final_energy"),
+        ("ORBITAL ENERGIES", "_on_orbital_energies"),
+        ("Expectation value of", "_on_s2"),
+        ("Ideal value", "_on_ideal_s2"),
+        ("N(Total)", "_on_integrated_electrons"),
+        ("E(BrokenSym)", "_on_bs_energy"),
+        ("E(High-Spin)      =", "_on_hs_energy"),
+        ("Number of correlated electrons", "_on_correlated_electrons"),
+        ("Reference energy", "_on_ref_energy"),
+        ("Final correlation energy", "_on_final_corr_energy"),
+        ("E(CORR)", "_on_ecorr"),
+        ("CORRELATION ENERGY", "_on_mp2_corr_energy"),
+        ("chemical core electrons", "_on_mp2_core_electrons"),
+        ("Extrapolated CBS SCF energy", "_on_extrap_scf"),
+        ("Extrapolated CBS correlation energy", "_on_extrap_corr"),
+        ("Cardinal #:", "_on_cardinal"),
+        ("SCF energy with basis", "_on_scf_energy_basis"),
+        ("Total Energy Correction :", "_on_nevpt2"),
+        ("MACRO-ITERATION", "_on_macro_iter"),
+        ("HAS CONVERGED", "_on_casscf_converged"),
+        ("ERROR (ORCA_CASSCF): Convergence Failure.", "_on_casscf_failed"),
+        ("Warning: Active Space composition changed by more than", "_on_casscf_failed"),
+        ("GEOMETRY OPTIMIZATION CYCLE", "_on_opt_cycle"),
+        ("|Geometry convergence|", "_on_geom_conv"),
+        ("FINAL ENERGY EVALUATION AT THE STATIONARY POINT", "_on_stationary_point"),
+        ("***               (AFTER", "_on_after_cycles"),
+        ("OPTIMIZATION RUN DONE", "_on_opt_done"),
+        ("The optimization did not converge but", "_on_opt_not_converged"),
+        ("RELAXED SURFACE SCAN STEP", "_on_scan_step"),
+        ("VIBRATIONAL FREQUENCIES", "_on_vib_freqs"),
+        ("The molecule is recognized as being linear", "_on_linear"),
+        ("Temperature         ...", "_on_temperature"),
+        ("G-E(el)", "_on_gibbs"),
+        ("Zero point", "_on_zpe"),
+        ("Final entropy term", "_on_entropy"),
+        ("Total thermal correction", "_on_thermal"),
+        ("Thermal Enthalpy correction", "_on_enthalpy_term"),
+    )
+    MATCHER = KeywordMatcher([key for key, _ in HANDLERS])
+
+    def __init__(self, filename: str = ""):
+        self.res = OrcaJobResult(filename)
+        #! MATCHER keyword index -> bound handler methods
+        self._dispatch: List[List[Callable[[str], None]]] = [
+            [] for _ in self.MATCHER.keywords
+        ]
+        for key, name in self.HANDLERS:
+            idx = self.MATCHER.keywords.index(key)
+            self._dispatch[idx].append(getattr(self, name))
+        self._tail: Deque[str] = deque(maxlen=TAIL_LINES)
+        #! the active section gets every line until it returns False
+        self._section: Optional[Callable[[str], bool]] = None
+        self._deferred: List[List] = []  # * [lines to go, callback]
+        self._header_done = False
+        self._input_done = False
+        self._simple_input = ""
+        self._geom: List[str] = []
+        self._geom_conv: List[str] = []
+        self._homo: Optional[float] = None
+        self._lumo: Optional[float] = None
+        self._orb_rows = False
+        self._freqs: List[Tuple[int, float]] = []
+        self._freq_seen = False
+        self._scf_open = False
+        self._last_cycle: Optional[int] = None
+        self._after_cycles: Optional[int] = None
+        self._stationary = False
+        self._thermal: Optional[float] = None
+        self._enthalpy_term: Optional[float] = None
+
+    # * ------------------------------------------------------------------
+    # * driver
+    # * ------------------------------------------------------------------
+    def feed(self, line: str) -> None:
+        """Processes one line of the output (with or without trailing newline)."""
+        self._tail.append(line)
+        if self._deferred:
+            self._run_deferred(line)
+        if self._section is not None and not self._section(line):
+            self._section = None
+        for idx in self.MATCHER.matches(line):
+            for handler in self._dispatch[idx]:
+                handler(line)
+
+    def _run_deferred(self, line: str) -> None:
+        due = []
+        for item in self._deferred:
+            item[0] -= 1
+            if item[0] == 0:
+                due.append(item)
+        for item in due:
+            self._deferred.remove(item)
+            item[1](line)
+
+    def _defer(self, nlines: int, callback: Callable[[str], None]) -> None:
+        """Calls callback on the nlines-th line after the current one."""
+        self._deferred.append([nlines, callback])
+
+    def result(self) -> OrcaJobResult:
+        """
+        Returns the result for everything fed so far.
+        Can be called repeatedly (e.g. while the job is still running).
+        """
+        res = replace(self.res, errors=list(self.res.errors))
+
+        for line in reversed(self._tail):
+            found = TAIL_MATCHER.matches(line)
+            if not found:
+                continue
+            line = line.rstrip("\n")
+            for idx in found:
+                keyword = TAIL_MATCHER.keywords[idx]
+                if keyword == TERMINATED:
+                    res.run_complete = True
+                elif keyword == RUN_TIME:
+                    res.run_time = line.split()[3:]
+                else:
+                    for sig in SIGNATURES_BY_TEXT[keyword]:
+                        self._apply_error(res, sig, line)
+        if res.scf_failed:
+            res.scf_converged = False
+
+        res.scf_still_running = self._scf_open and not res.run_complete
+        if self._homo is not None and self._lumo is not None:
+            res.homo_lumo_gap = self._lumo - self._homo
+        if res.post_hf_method in ("CC", "QCI"):
+            if res.correlated_electrons is not None and res.num_electrons is not None:
+                res.frozen_electrons = str(
+                    int(res.num_electrons) - int(res.correlated_electrons)
+                )
+        elif res.post_hf_method == "MP2" and res.nofrozencore:
+            res.frozen_electrons = "0"
+
+        # * geometry optimisation
+        res.opt_job = res.job_type in OPT_JOBS
+        res.opt_cycle = self._last_cycle
+        if res.run_complete and res.opt_converged and self._after_cycles is not None:
+            res.opt_cycle = self._after_cycles
+
+        # * frequencies
+        if res.job_type in FREQ_JOBS:
+            if res.run_complete:
+                res.freq_job = True
+                res.freq_section = "done" if self._freq_seen else "notyetdone"
+            else:
+                res.freq_section = "notpresent"
+        res.frequencies = [freq for _, freq in self._freqs]
+        lowest_idx = 5 if res.linear else 6
+        for idx, freq in self._freqs:
+            if idx == lowest_idx:
+                res.lowest_vib = freq
+        if None not in (self._thermal, res.zpe_corr, self._enthalpy_term):
+            res.enthalpy_corr = self._thermal + res.zpe_corr + self._enthalpy_term
+        return res
+
+    @staticmethod
+    def _apply_error(res: OrcaJobResult, sig: ErrorSignature, line: str) -> None:
+        res.orca_crash = True
+        if sig.early:
+            res.early_crash = True
+        if sig.message is not None:
+            res.errors.append(line if sig.message == LINE else sig.message)
+        if sig.flag is not None:
+            setattr(res, sig.flag, True)
+
+    # * ------------------------------------------------------------------
+    # * program, input and molecule (header part of the output)
+    # * ------------------------------------------------------------------
+    def _on_version(self, line: str) -> None:
+        if self.res.version is None:
+            self.res.version = line.split()[2]
+
+    def _on_ndo_warning(self, line: str) -> None:
+        if not self._input_done:
+            self.res.semiempirical = True
+
+    def _on_input_file(self, line: str) -> None:
+        if not self._input_done and self.res.version is not None:
+            self._section = self._input_section
+
+    def _input_section(self, line: str) -> bool:
+        if "END OF INPUT" in line:
+            self._input_done = True
+            self.res.input_line = self._simple_input
+            classify_input_line(self.res, self._simple_input)
+            # * Relaxed surface scans announce themselves 4 lines further down
+            self._defer(4, self._on_scan_test)
+            return False
+        lower = line.lower()
+        if "!" in line and "#" not in line:
+            self._simple_input += " ".join(lower.split()[2:]).replace("!", "")
+        if "%casscf" in line:
+            self.res.casscf = True
+        if "$new_job" in line:
+            self.res.new_job = True
+        if "flipspin" in lower or "brokensym" in lower:
+            self.res.broken_sym = True
+        if "finalms" in lower:
+            self.res.bs_ms = float(line.split()[-1])
+        return True
+
+    def _on_scan_test(self, line: str) -> None:
+        if "Relaxed" in line:
+            self.res.job_type = "scan"
+            self._defer(3, self._on_scan_params)
+
+    def _on_scan_params(self, line: str) -> None:
+        res = self.res
+        parts = line.split()
+        res.scan_coord_type = parts[0]
+        res.scan_steps = int(parts[-1])
+        if res.scan_coord_type == "Bond":
+            res.scan_atoms = [parts[2][:-1], parts[3][:-2]]
+        elif res.scan_coord_type == "Angle":
+            res.scan_atoms = [parts[2][:-1], parts[3][:-1], parts[4][:-2]]
+        elif res.scan_coord_type == "Dihedral":
+            res.scan_atoms = [
+                parts[2][:-1],
+                parts[3][:-1],
+                parts[4][:-1],
+                parts[5][:-2],
+            ]
+        res.scan_start = float(parts[-6])
+        res.scan_end = float(parts[-4])
+        res.scan_change = (res.scan_end - res.scan_start) / (res.scan_steps - 1)
+
+    def _on_autostart(self, line: str) -> None:
+        if self._input_done and self.res.basis_functions is None:
+            self.res.autostart = True
+
+    def _on_contracted_bf(self, line: str) -> None:
+        if self.res.basis_functions is None and not self.res.semiempirical:
+            self.res.basis_functions = line.split()[-1]
+
+    def _on_number_bf(self, line: str) -> None:
+        if self.res.basis_functions is None and not self.res.semiempirical:
+            self.res.basis_functions = line.split()[5]
+
+    def _on_mpi_procs(self, line: str) -> None:
+        if self.res.parallel_procs is None:
+            self.res.parallel_procs = line.split()[4]
+
+    def _on_scf_settings(self, line: str) -> None:
+        if not self._header_done and self.res.scf_method is None:
+            # * the method is listed 3 lines below the banner
+            self._defer(3, self._on_scf_method)
+
+    def _on_scf_method(self, line: str) -> None:
+        scftemp = line.split()
+        if scftemp[0] == "ZDO-Hamiltonian":
+            self.res.semiempirical = True
+            self.res.scf_method = scftemp[3]
+        else:
+            self.res.scf_method = scftemp[4]
+        self.res.dft = "DFT" in self.res.scf_method
+
+    def _on_hftyp(self, line: str) -> None:
+        if not self._header_done and self.res.scf_method is not None:
+            self.res.scf_type = line.split()[4]
+
+    def _on_charge(self, line: str) -> None:
+        if not self._header_done and self.res.scf_method is not None:
+            self.res.charge = line.split()[4]
+
+    def _on_mult(self, line: str) -> None:
+        if not self._header_done and self.res.charge is not None:
+            self.res.mult = int(line.split()[3])
+            self.res.spin = (self.res.mult - 1) / 2.0
+
+    def _on_nel(self, line: str) -> None:
+        if not self._header_done and self.res.charge is not None:
+            self.res.num_electrons = line.split()[5]
+
+    def _on_enuc(self, line: str) -> None:
+        if not self._header_done and self.res.charge is not None:
+            self.res.nuc_repulsion = float(line.split()[4])
+            self._header_done = True
+
+    def _on_cartesian(self, line: str) -> None:
+        if self._input_done:
+            self._geom = []
+            self._section = self._geometry_section
+
+    def _geometry_section(self, line: str) -> bool:
+        stripped = line.strip()
+        if not stripped:
+            if not self._geom:
+                return True
+            self.res.last_geometry = self._geom
+            if self.res.num_atoms is None:
+                self.res.input_geometry = self._geom
+                self.res.num_atoms = len(self._geom)
+            return False
+        if not stripped.startswith("-") and "CARTESIAN" not in stripped:
+            self._geom.append(stripped)
+        return True
+
+    # * ------------------------------------------------------------------
+    # * SCF, orbitals and post-HF
+    # * ------------------------------------------------------------------
+    def _on_scf_iterations(self, line: str) -> None:
+        self._scf_open = True
+        self.res.scf_converged = None
+        self.res.scf_iteration = None
+        self.res.scf_iter_energy = None
+        self.res.scf_delta_e = None
+        self._section = self._scf_iter_section
+
+    def _scf_iter_section(self, line: str) -> bool:
+        # * ends with the SUCCESS/ERROR box, DIIS/SOSCF notes are skipped
+        if "*****" in line or "SCF CONVERGED" in line or "SCF NOT CONVERGED" in line:
+            return False
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].isdigit():
+            try:
+                energy = float(parts[1])
+            except ValueError:
+                return True
+            self.res.scf_iteration = int(parts[0])
+            self.res.scf_iter_energy = energy
+            self.res.scf_delta_e = float(parts[2]) if len(parts) > 2 else None
+        return True
+
+    def _on_scf_converged(self, line: str) -> None:
+        self._scf_open = False
+        self.res.scf_converged = True
+        self.res.scf_cycles = int(line.split()[4])
+        # * correlation energies are taken from the first lines after the last SCF
+        self.res.ref_energy = None
+        self.res.corr_energy = None
+
+    def _on_scf_not_converged(self, line: str) -> None:
+        self._scf_open = False
+        self.res.scf_converged = False
+        self.res.scf_unconverged_cycles = int(line.split()[5])
+
+    def _on_scf_almost_converged(self, line: str) -> None:
+        self.res.scf_almost_converged = True
+
+    def _on_total_energy(self, line: str) -> None:
+        self.res.pure_scf_energy = float(line.split()[3])
+
+    def _on_final_energy(self, line: str) -> None:
+        energy = float(line.split()[4])
+        self.res.scf_energy = energy
+        self.res.opt_energy = energy
+        if self._stationary and self.res.final_opt_energy is None:
+            self.res.final_opt_energy = energy
+
+    def _on_orbital_energies(self, line: str) -> None:
+        self._homo = None
+        self._lumo = None
+        self._orb_rows = False
+        self._section = self._orbital_section
+
+    def _orbital_section(self, line: str) -> bool:
+        if "SPIN DOWN ORBITALS" in line:
+            return False
+        parts = line.split()
+        if not parts:
+            return not self._orb_rows
+        if len(parts) == 4 and "*" not in line:
+            occ = parts[1]
+            if occ in ("1.0000", "2.0000"):
+                self._orb_rows = True
+                self._homo = float(parts[-1])
+                self._lumo = None
+            elif occ == "0.0000":
+                self._orb_rows = True
+                if self._lumo is None:
+                    self._lumo = float(parts[-1])
+        return True
+
+    def _on_s2(self, line: str) -> None:
+        self.res.s2_value = line.split()[-1]
+
+    def _on_ideal_s2(self, line: str) -> None:
+        self.res.ideal_s2_value = line.split()[-1]
+
+    def _on_integrated_electrons(self, line: str) -> None:
+        self.res.integrated_electrons = line.split()[2]
+
+    def _on_bs_energy(self, line: str) -> None:
+        self.res.bs_energy = float(line.split()[2])
+
+    def _on_hs_energy(self, line: str) -> None:
+        self.res.hs_energy = float(line.split()[2])
+
+    def _on_correlated_electrons(self, line: str) -> None:
+        if self.res.post_hf_method in ("CC", "QCI"):
+            self.res.correlated_electrons = line.split()[5]
+
+    def _on_ref_energy(self, line: str) -> None:
+        if self.res.post_hf_method in ("CC", "QCI") and self.res.ref_energy is None:
+            self.res.ref_energy = float(line.split()[3])
+
+    def _on_final_corr_energy(self, line: str) -> None:
+        if self.res.post_hf_method == "CC" and self.res.corr_energy is None:
+            self.res.corr_energy = float(line.split()[4])
+
+    def _on_ecorr(self, line: str) -> None:
+        if self.res.post_hf_method in ("CC", "QCI") and self.res.corr_energy is None:
+            self.res.corr_energy = float(line.split()[2])
+
+    def _on_mp2_corr_energy(self, line: str) -> None:
+        if self.res.post_hf_method == "MP2" and self.res.corr_energy is None:
+            self.res.corr_energy = float(line.split()[3])
+
+    def _on_mp2_core_electrons(self, line: str) -> None:
+        if self.res.post_hf_method == "MP2":
+            self.res.frozen_electrons = line.split()[1].lstrip("NCore=")
+
+    def _on_extrap_scf(self, line: str) -> None:
+        self.res.extrap_scf_energy = float(line.split()[-2])
+
+    def _on_extrap_corr(self, line: str) -> None:
+        self.res.extrap_corr_energy = float(line.split()[-2])
+
+    def _on_cardinal(self, line: str) -> None:
+        if self.res.extrapolate:
+            self.res.basis_sets.append(line.split()[-1])
+
+    def _on_scf_energy_basis(self, line: str) -> None:
+        if self.res.extrapolate:
+            self.res.basis_sets.append(line.split()[4][:-1])
+
+    def _on_nevpt2(self, line: str) -> None:
+        if self.res.casscf:
+            self.res.nevpt2_corr_energy = float(line.split()[6])
+
+    def _on_macro_iter(self, line: str) -> None:
+        if self.res.casscf:
+            self.res.last_macro_iter = line.split()[1].rstrip(":")
+
+    def _on_casscf_converged(self, line: str) -> None:
+        if "THE CAS-SCF GRADIENT HAS CONVERGED" in line or (
+            "THE CAS-SCF ENERGY   HAS CONVERGED" in line
+        ):
+            self.res.casscf_converged = True
+
+    def _on_casscf_failed(self, line: str) -> None:
+        self.res.scf_converged = False
+        self.res.casscf_converged = False
+
+    # * ------------------------------------------------------------------
+    # * geometry optimisation and relaxed surface scans
+    # * ------------------------------------------------------------------
+    def _on_opt_cycle(self, line: str) -> None:
+        self._last_cycle = int(line.split()[4])
+
+    def _on_geom_conv(self, line: str) -> None:
+        self._geom_conv = [line.strip()]
+        #! new cycle: don't mix its rows with the ones of the previous table
+        for attr in GEOM_CONV_ITEMS.values():
+            setattr(self.res, attr, None)
+        self._section = self._geom_conv_section
+
+    def _geom_conv_section(self, line: str) -> bool:
+        stripped = line.strip()
+        if not stripped:
+            self.res.geom_conv_table = self._geom_conv
+            return False
+        if "|Geometry convergence|" not in stripped:
+            self._geom_conv.append(stripped)
+            parts = stripped.split()
+            attr = GEOM_CONV_ITEMS.get(" ".join(parts[:2]))
+            if attr is not None and len(parts) > 2:
+                setattr(self.res, attr, float(parts[2]))
+        return True
+
+    def _on_stationary_point(self, line: str) -> None:
+        self._stationary = True
+
+    def _on_after_cycles(self, line: str) -> None:
+        self._after_cycles = int(line.split()[2])
+
+    def _on_opt_done(self, line: str) -> None:
+        self.res.opt_converged = True
+        if self.res.final_opt_energy is None:
+            self.res.final_opt_energy = self.res.opt_energy
+        if self.res.opt_energy is not None:
+            self.res.scan_energies.append(self.res.opt_energy)
+
+    def _on_opt_not_converged(self, line: str) -> None:
+        self.res.opt_not_converged = True
+
+    def _on_scan_step(self, line: str) -> None:
+        self.res.scan_step_numbers.append(line.split()[5])
+
+    # * ------------------------------------------------------------------
+    # * frequencies and thermochemistry
+    # * ------------------------------------------------------------------
+    def _on_vib_freqs(self, line: str) -> None:
+        self._freq_seen = True
+        self._freqs = []
+        self.res.imaginary_modes = []
+        self._section = self._freq_section
+
+    def _freq_section(self, line: str) -> bool:
+        if "NORMAL MODES" in line:
+            return False
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].endswith(":") and parts[0][:-1].isdigit():
+            freq = float(parts[1])
+            self._freqs.append((int(parts[0][:-1]), freq))
+            if "imaginary" in line:
+                self.res.imaginary_modes.append(freq)
+        return True
+
+    def _on_linear(self, line: str) -> None:
+        self.res.linear = True
+
+    def _on_temperature(self, line: str) -> None:
+        self.res.temperature = float(line.split()[2])
+
+    def _on_gibbs(self, line: str) -> None:
+        self.res.gibbs_corr = float(line.split()[2])
+
+    def _on_zpe(self, line: str) -> None:
+        self.res.zpe_corr = float(line.split()[4])
+
+    def _on_entropy(self, line: str) -> None:
+        self.res.entropy_corr = float(line.split()[4])
+
+    def _on_thermal(self, line: str) -> None:
+        self._thermal = float(line.split()[3])
+
+    def _on_enthalpy_term(self, line: str) -> None:
+        self._enthalpy_term = float(line.split()[4])
+
+
+def parse_orca_output(filename: str) -> OrcaJobResult:
+    """Reads an ORCA output file once and returns its OrcaJobResult."""
+    start = time.perf_counter()
+    parser = OrcaOutputParser(filename)
+    # * errors="ignore" works around the odd encoding issue in ORCA outputs
+    with open(filename, errors="ignore") as fp:
+        for line in fp:
+            parser.feed(line)
+    res = parser.result()
+    res.parse_time = time.perf_counter() - start
+    return res
+
+
+class OutputFollower:
+    """
+    Incremental parser for a growing (running) output file.
+
+    Every poll() seeks to the byte offset reached by the previous call and
+    feeds only the complete lines appended since then, so a refresh costs the
+    same however large the output already is. An unfinished last line is kept
+    back until its newline arrives. If the file shrinks (job restarted with
+    the same name) parsing starts over.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.reset()
+
+    def reset(self) -> None:
+        """Forgets everything parsed so far, the next poll() starts at byte 0."""
+        self.parser = OrcaOutputParser(self.filename)
+        self.offset = 0
+        self._partial = b""
+
+    def poll(self) -> int:
+        """Parses the newly appended lines. Returns how many there were."""
+        size = os.path.getsize(self.filename)
+        if size < self.offset:
+            self.reset()
+        if size == self.offset:
+            return 0
+        with open(self.filename, "rb") as fp:
+            fp.seek(self.offset)
+            data = fp.read(size - self.offset)
+        self.offset += len(data)
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for line in lines:
+            # * errors="ignore" like parse_orca_output
+            self.parser.feed(line.decode(errors="ignore") + "\n")
+        return len(lines)
+
+    def result(self) -> OrcaJobResult:
+        return self.parser.result()
+
+
+def available_cpus() -> int:
+    """Number of cores this process may use (respects taskset/cgroup pinning)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # * not available on Windows/macOS
+        return os.cpu_count() or 1
+
+
+def parse_orca_outputs(
+    filenames: Iterable[Union[str, OrcaJobResult]], jobs: int = 1
+) -> Iterator[OrcaJobResult]:
+    """
+    Parses many output files, yielding the results in the order of filenames.
+
+    jobs > 1 uses a process pool with that many workers, jobs <= 0 uses all
+    available cores. With jobs == 1 (or a single file) no pool is started at
+    all, so it is safe to use on login nodes.
+
+    filenames may be a generator (e.g. a directory walk that is still
+    running): files are handed to the pool as they come and every result is
+    yielded as soon as it and all results before it are done. Items that
+    already are an OrcaJobResult (cache hits) are passed through in place.
+    """
+    if jobs <= 0:
+        jobs = available_cpus()
+    if isinstance(filenames, Sequence):
+        jobs = min(jobs, len(filenames))
+    if jobs <= 1:
+        for item in filenames:
+            yield item if isinstance(item, OrcaJobResult) else parse_orca_output(item)
+        return
+    # * enough queued work to keep all workers busy, without reading ahead forever
+    window = jobs * PARSE_WINDOW
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending: Deque[Future] = deque()
+        for item in filenames:
+            if isinstance(item, OrcaJobResult):
+                future: Future = Future()
+                future.set_result(item)
+            else:
+                future = pool.submit(parse_orca_output, item)
+            pending.append(future)
+            while pending and (pending[0].done() or len(pending) >= window):
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.0
+
+Machine-readable records for orcajobcheck.py (--format json|jsonl|parquet).
+
+Every OrcaJobResult is turned into one flat record (RECORD_FIELDS) and written
+as soon as it is available, so a big directory scan can be piped into other
+tools while it is still running:
+    - jsonl:   one JSON object per line, flushed after every file
+    - json:    one JSON array, the elements are written one by one
+    - parquet: row groups of PARQUET_BATCH records (needs pyarrow)
+
+Usage:
+    orcajobcheck.py . --format jsonl | jq .final_energy
+    orcajobcheck.py . --format parquet --output results.parquet
+"""
+
+# * Changelog:
+# * 0.1.0 - Initial release
+
+import json
+import sys
+from typing import IO, Any, Dict, List, Optional
+
+from orca_out_parser import OrcaJobResult
+
+VERSION = "0.1.0"
+
+FORMATS = ("json", "jsonl", "parquet")
+
+PARQUET_BATCH = 500  # * records per parquet row group
+
+#! record key -> parquet type ("float", "int", "bool", "str", "floats", "strs")
+RECORD_FIELDS = {
+    "filename": "str",
+    "job_type": "str",
+    "functional": "str",
+    "scf_method": "str",
+    "run_complete": "bool",
+    "orca_crash": "bool",
+    "early_crash": "bool",
+    "scf_converged": "bool",
+    "scf_cycles": "int",
+    "scf_unconverged_cycles": "int",
+    "opt_converged": "bool",
+    "opt_cycle": "int",
+    "casscf_converged": "bool",
+    "final_energy": "float",
+    "final_opt_energy": "float",
+    "ref_energy": "float",
+    "corr_energy": "float",
+    "gibbs_corr": "float",
+    "imaginary_modes": "floats",
+    "errors": "strs",
+    "parse_time": "float",
+}
+
+
+def result_record(res: OrcaJobResult) -> Dict[str, Any]:
+    """Flat, JSON serialisable record of one result."""
+    record = {}
+    for key in RECORD_FIELDS:
+        if key == "final_energy":
+            record[key] = res.scf_energy
+        else:
+            record[key] = getattr(res, key)
+    return record
+
+
+class RecordWriter:
+    """Writes records to a text stream (json, jsonl) or a parquet file."""
+
+    def __init__(self, fmt: str, stream: Optional[IO] = None):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt}, use one of {', '.join(FORMATS)}")
+        self.fmt = fmt
+        self.stream = sys.stdout if stream is None else stream
+        self.count = 0
+        self._batch: List[Dict[str, Any]] = []
+        self._parquet = None
+        if fmt == "parquet":
+            self._open_parquet()
+
+    def _open_parquet(self) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "--format parquet needs pyarrow (pip install pyarrow)"
+            ) from None
+        types = {
+            "float": pa.float64(),
+            "int": pa.int64(),
+            "bool": pa.bool_(),
+            "str": pa.string(),
+            "floats": pa.list_(pa.float64()),
+            "strs": pa.list_(pa.string()),
+        }
+        self._pa = pa
+        self._schema = pa.schema(
+            [(key, types[kind]) for key, kind in RECORD_FIELDS.items()]
+        )
+        sink = getattr(self.stream, "buffer", self.stream)
+        self._parquet = pq.ParquetWriter(sink, self._schema)
+
+    def write(self, res: OrcaJobResult) -> None:
+        record = result_record(res)
+        if self.fmt == "jsonl":
+            self.stream.write(json.dumps(record) + "\n")
+            self.stream.flush()
+        elif self.fmt == "json":
+            self.stream.write("[\n" if self.count == 0 else ",\n")
+            self.stream.write(json.dumps(record))
+            self.stream.flush()
+        else:
+            self._batch.append(record)
+            if len(self._batch) >= PARQUET_BATCH:
+                self._flush_parquet()
+        self.count += 1
+
+    def _flush_parquet(self) -> None:
+        if self._batch:
+            table = self._pa.Table.from_pylist(self._batch, schema=self._schema)
+            self._parquet.write_table(table)
+            self._batch = []
+
+    def close(self) -> None:
+        if self.fmt == "json":
+            self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+            self.stream.flush()
+        elif self.fmt == "parquet":
+            self._flush_parquet()
+            self._parquet.close()
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.3.0
+
+Persistent on-disk cache for the OrcaJobResult objects of orca_out_parser.py.
+
+The results are stored in a small SQLite file next to the outputs
+(CACHE_NAME). A cached result is reused as long as path, size, mtime and the
+checksum of the last TAIL_BYTES bytes of the output are unchanged, so only new
+or still growing outputs are parsed again. Results written by another parser
+version are ignored.
+
+The same file also keeps the section index (banner -> byte offsets) built by
+orca_section_index.py, under the same file key.
+
+Usage:
+    with ResultCache.for_directory(".") as cache:
+        for res in cached_parse_orca_outputs(filelist, jobs=4, cache=cache):
+            ...
+"""
+
+# * Changelog:
+# * 0.3.0 - cached_parse_orca_outputs streams (filenames may be a generator)
+# * 0.2.0 - sections table for the byte offset index of orca_section_index.py
+# * 0.1.0 - Initial release
+
+import hashlib
+import json
+import os
+import sqlite3
+from collections import deque
+from dataclasses import asdict
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from orca_out_parser import VERSION as PARSER_VERSION
+from orca_out_parser import OrcaJobResult, parse_orca_outputs
+
+VERSION = "0.3.0"
+
+CACHE_NAME = ".orcajobcheck_cache.sqlite"
+TAIL_BYTES = 4096
+COMMIT_EVERY = 200  # * results written before the next commit
+
+FileKey = Tuple[int, int, str]  # * size, mtime (ns), tail checksum
+
+
+def file_key(filename: str) -> FileKey:
+    """Size, mtime and checksum of the last TAIL_BYTES bytes of a file."""
+    stat = os.stat(filename)
+    with open(filename, "rb") as fp:
+        fp.seek(max(0, stat.st_size - TAIL_BYTES))
+        tail_hash = hashlib.blake2b(fp.read(), digest_size=16).hexdigest()
+    return stat.st_size, stat.st_mtime_ns, tail_hash
+
+
+class ResultCache:
+    """SQLite backed cache: absolute path -> (file key, OrcaJobResult)."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "tail_hash TEXT, parser_version TEXT, result TEXT)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sections ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "tail_hash TEXT, index_version TEXT, sections TEXT)"
+        )
+        self._pending = 0
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "ResultCache":
+        return cls(os.path.join(directory, CACHE_NAME))
+
+    def get(self, filename: str, key: FileKey) -> Optional[OrcaJobResult]:
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, tail_hash, parser_version, result "
+            "FROM results WHERE path = ?",
+            (os.path.abspath(filename),),
+        ).fetchone()
+        if row is None or tuple(row[:3]) != key or row[3] != PARSER_VERSION:
+            return None
+        try:
+            res = OrcaJobResult(**json.loads(row[4]))
+        except (TypeError, ValueError):  # * stale or broken entry
+            return None
+        res.filename = filename  # * same file, maybe given by a different path
+        return res
+
+    def put(self, res: OrcaJobResult, key: FileKey) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                os.path.abspath(res.filename),
+                *key,
+                PARSER_VERSION,
+                json.dumps(asdict(res)),
+            ),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def get_sections(
+        self, filename: str, key: FileKey, version: str
+    ) -> Optional[Dict[str, List[int]]]:
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, tail_hash, index_version, sections "
+            "FROM sections WHERE path = ?",
+            (os.path.abspath(filename),),
+        ).fetchone()
+        if row is None or tuple(row[:3]) != key or row[3] != version:
+            return None
+        return json.loads(row[4])
+
+    def put_sections(
+        self, filename: str, key: FileKey, version: str, index: Dict[str, List[int]]
+    ) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sections VALUES (?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(filename), *key, version, json.dumps(index)),
+        )
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self.commit()
+
+    def commit(self) -> None:
+        self.conn.commit()
+        self._pending = 0
+
+    def close(self) -> None:
+        self.commit()
+        self.conn.close()
+
+    def __enter__(self) -> "ResultCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def cached_parse_orca_outputs(
+    filenames: Iterable[str], jobs: int = 1, cache: Optional[ResultCache] = None
+) -> Iterator[OrcaJobResult]:
+    """
+    Like parse_orca_outputs, but unchanged files are taken from the cache.
+    Results are still yielded in the order of filenames, and filenames may be
+    a generator (results stream while it is still producing names).
+    """
+    if cache is None:
+        yield from parse_orca_outputs(filenames, jobs)
+        return
+
+    keys: Deque[Optional[FileKey]] = deque()  # * None for cache hits
+
+    def lookup() -> Iterator[Union[str, OrcaJobResult]]:
+        for filename in filenames:
+            key = file_key(filename)
+            res = cache.get(filename, key)
+            keys.append(key if res is None else None)
+            yield filename if res is None else res
+
+    for res in parse_orca_outputs(lookup(), jobs):
+        key = keys.popleft()
+        if key is not None:
+            cache.put(res, key)
+        yield res
+    cache.commit()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.2.0
+
+Byte offset index of the sections of an ORCA output file.
+
+The output is memory-mapped and searched for all banners in SECTION_BANNERS
+at once (one precompiled bytes regex, a single pass over the file and no line
+splitting at all). The index maps
+every section name to the byte offsets of its banner lines, so queries like
+"last geometry" or "frequencies" seek straight to the right place instead of
+reading the whole (possibly huge) file again. The index is stored in the
+result cache of orcajobcheck.py (.orcajobcheck_cache.sqlite) and reused while
+the file is unchanged.
+
+Usage:
+    python3 orca_section_index.py job.out               # * list the sections
+    python3 orca_section_index.py job.out geometry      # * last geometry
+    python3 orca_section_index.py job.out frequencies   # * last frequencies
+
+    from orca_section_index import section_index, last_geometry
+    index = section_index("job.out")
+    print(last_geometry("job.out", index))
+"""
+
+# * Changelog:
+# * 0.2.0 - All banners found in a single pass (BANNER_REGEX)
+# * 0.1.0 - Initial release
+
+import mmap
+import os
+import re
+import sqlite3
+import sys
+from typing import Dict, Iterator, List, Optional
+
+from orca_result_cache import ResultCache, file_key
+
+VERSION = "0.2.0"
+
+#! section name -> banner that starts it (bytes, searched in the mmap)
+SECTION_BANNERS = {
+    "input": b"INPUT FILE",
+    "geometry": b"CARTESIAN COORDINATES (ANGSTROEM)",
+    "scf": b"SCF ITERATIONS",
+    "orbitals": b"ORBITAL ENERGIES",
+    "final_energy": b"FINAL SINGLE POINT ENERGY",
+    "opt_cycle": b"GEOMETRY OPTIMIZATION CYCLE",
+    "geom_conv": b"|Geometry convergence|",
+    "opt_done": b"OPTIMIZATION RUN DONE",
+    "frequencies": b"VIBRATIONAL FREQUENCIES",
+    "normal_modes": b"NORMAL MODES",
+    "thermochemistry": b"THERMOCHEMISTRY AT",
+}
+
+#! one alternation of all banners, the match tells the section
+BANNER_REGEX = re.compile(b"|".join(map(re.escape, SECTION_BANNERS.values())))
+BANNER_SECTIONS = {banner: name for name, banner in SECTION_BANNERS.items()}
+
+SectionIndex = Dict[str, List[int]]  # * name -> byte offsets of the banner lines
+
+
+def build_section_index(filename: str) -> SectionIndex:
+    """Scans a memory map of the file for all SECTION_BANNERS in one pass."""
+    index: SectionIndex = {name: [] for name in SECTION_BANNERS}
+    with open(filename, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:  # * empty files cannot be mapped
+            return index
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for match in BANNER_REGEX.finditer(mm):
+                # * offset of the start of the banner line
+                index[BANNER_SECTIONS[match.group()]].append(
+                    mm.rfind(b"\n", 0, match.start()) + 1
+                )
+    return index
+
+
+def section_index(filename: str, cache: Optional[ResultCache] = None) -> SectionIndex:
+    """Section index of a file, taken from the cache if the file is unchanged."""
+    if cache is None:
+        return build_section_index(filename)
+    key = file_key(filename)
+    index = cache.get_sections(filename, key, VERSION)
+    if index is None:
+        index = build_section_index(filename)
+        cache.put_sections(filename, key, VERSION, index)
+        cache.commit()
+    return index
+
+
+def read_lines(filename: str, offset: int) -> Iterator[str]:
+    """Lines of the file starting at a byte offset."""
+    with open(filename, "rb") as fp:
+        fp.seek(offset)
+        for line in fp:
+            # * errors="ignore" works around the odd encoding issue in ORCA outputs
+            yield line.decode(errors="ignore")
+
+
+def section_lines(
+    filename: str, index: SectionIndex, name: str, occurrence: int = -1
+) -> Iterator[str]:
+    """Lines from the banner of a section onwards (last occurrence by default)."""
+    offsets = index.get(name, [])
+    if not offsets:
+        return iter(())
+    return read_lines(filename, offsets[occurrence])
+
+
+def last_geometry(filename: str, index: SectionIndex) -> List[str]:
+    """Last CARTESIAN COORDINATES (ANGSTROEM) block, one stripped line per atom."""
+    geometry: List[str] = []
+    lines = section_lines(filename, index, "geometry")
+    for nline, line in enumerate(lines):
+        if nline < 2:  # * banner and dashes
+            continue
+        if not line.strip():
+            break
+        geometry.append(line.strip())
+    return geometry
+
+
+def frequencies(filename: str, index: SectionIndex) -> List[float]:
+    """All frequencies (cm**-1) of the last VIBRATIONAL FREQUENCIES block."""
+    freqs: List[float] = []
+    for line in section_lines(filename, index, "frequencies"):
+        if "NORMAL MODES" in line:
+            break
+        parts = line.split()
+        if len(parts) >= 2 and parts[0].endswith(":") and parts[0][:-1].isdigit():
+            freqs.append(float(parts[1]))
+        elif freqs and not parts:
+            break
+    return freqs
+
+
+def main() -> None:
+    if len(sys.argv) < 2:
+        print("Usage: orca_section_index.py file.out [geometry|frequencies]")
+        sys.exit(1)
+    filename = sys.argv[1]
+    query = sys.argv[2] if len(sys.argv) > 2 else None
+    try:
+        cache = ResultCache.for_directory(os.path.dirname(filename) or ".")
+    except sqlite3.Error as err:
+        print("Section index cache disabled:", err)
+        cache = None
+    index = section_index(filename, cache)
+    if cache is not None:
+        cache.close()
+
+    if query is None:
+        for name, offsets in index.items():
+            if offsets:
+                print(f"{name:16} {len(offsets):6d} x   last at byte {offsets[-1]}")
+    elif query == "geometry":
+        for line in last_geometry(filename, index):
+            print(line)
+    elif query == "frequencies":
+        for freq in frequencies(filename, index):
+            print(f"{freq:10.2f} cm**-1")
+    else:
+        sys.exit("Unknown query " + query + ", use geometry or frequencies")
+
+
+if __name__ == "__main__":
+    main()
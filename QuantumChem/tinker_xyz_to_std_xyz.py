@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.4.0
+
+This script converts the Chem3D Tinker xyz files to standard xyz files.
+This is needed in order to use the .xyz files for any other program.
+Tinker xyz files have many useless numbers and lines that are not needed.
+
+MIT License
+
+Copyright (c) 2022 Martin Dagleish
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+
+# * Changelog:
+# * 0.4.0 - Non-interactive, uses the bulk conversion engine (xyz_convert.py);
+# *         files/directories as arguments, --jobs, --replace; moved to QuantumChem/
+# * 0.3.3 - Fixed regex pattern for rare cases where there is nothing after last z-coordinate.
+# * 0.3.2 - Fixed the replace implementation and move old_std when new is created.
+# * 0.3.1 - Fixed bug for coordinates with double digits
+# * 0.3.0 - Simplified the code (unnecessary if statements removed) and prettified the print statements.
+# * 0.2.0 - Added fix for negative values for the number of atoms and renewed the regex pattern.
+# * 0.1.0 - Initial release
+
+from xyz_convert import build_parser, run
+
+VERSION = "0.4.0"
+
+
+def main():
+    """
+    Main function for running the script.
+    """
+    parser = build_parser(
+        "tinker_xyz_to_std_xyz.py",
+        f"Convert Chem3D Tinker xyz files to standard xyz files (*_std.xyz), "
+        f"Lp and Xx are removed. Version {VERSION}",
+    )
+    args = parser.parse_args()
+    run(args.paths, args.jobs, replace=args.replace)
+
+
+if __name__ == "__main__":
+    main()
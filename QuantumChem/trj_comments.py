@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.0
+
+Registry of comment line formats of multi-xyz trajectories.
+
+Every format has a precompiled pattern (group 1 = energy) and an optional fast
+path (plain str.split, no regex) that is tried first. The format is sniffed
+once from the comment line of the first frame and then applied to all frames:
+    - xtb:    " energy: -290.188870669444 gnorm: 0.373175102785 xtb: 6.5.1"
+    - orca:   "Coordinates from ORCA-job name E -816.2341234"
+    - crest:  "     -23.45678901"  (crest_conformers.xyz, crest_rotamers.xyz)
+    - tinker: "... Potential Energy : -123.4567 Kcal/mole" (converted to E_h)
+    - plain:  anything else, no energies
+Frames whose comment line does not fit the format get NaN and are listed by
+parse_energies(), instead of a silent 0.0.
+
+More formats can be registered (before "plain", which matches everything):
+    register_format("mine", r"E=(-?\d+\.\d+)")
+"""
+
+# * Changelog:
+# * 0.1.0 - Initial release
+
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+VERSION = "0.1.0"
+
+HARTREE_TO_KCAL = 627.509474
+
+
+class CommentFormat(NamedTuple):
+    """Energy format of the comment lines of one program."""
+
+    name: str
+    pattern: "re.Pattern[str]"  # * group 1 = energy
+    fast: Optional[Callable[[str], float]] = None  # * may raise, then regex
+    scale: float = 1.0  # * factor to E_h
+
+
+def _fast_xtb(line: str) -> float:
+    parts = line.split(None, 2)
+    if parts[0] != "energy:":
+        raise ValueError
+    return float(parts[1])
+
+
+def _fast_orca(line: str) -> float:
+    parts = line.rsplit(None, 2)
+    if parts[1] != "E":
+        raise ValueError
+    return float(parts[2])
+
+
+def _fast_crest(line: str) -> float:
+    return float(line.split(None, 1)[0])
+
+
+#! sniffing order, "plain" is always last
+COMMENT_FORMATS: Dict[str, CommentFormat] = {}
+
+
+def register_format(
+    name: str,
+    pattern: str,
+    fast: Optional[Callable[[str], float]] = None,
+    scale: float = 1.0,
+) -> CommentFormat:
+    """Adds a format to the registry (sniffed before "plain")."""
+    fmt = CommentFormat(name, re.compile(pattern), fast, scale)
+    plain = COMMENT_FORMATS.pop("plain", None)
+    COMMENT_FORMATS[name] = fmt
+    if plain is not None:
+        COMMENT_FORMATS["plain"] = plain
+    return fmt
+
+
+register_format("xtb", r"energy:\s*(-?\d+\.\d+)", _fast_xtb)
+register_format(
+    "orca", r"^\w+ \w+ [a-zA-Z-]+ [a-zA-Z0-9_\-*]+ E (-?\d+\.\d+)", _fast_orca
+)
+register_format("crest", r"^\s*(-?\d+\.\d+)(?:\s|$)", _fast_crest)
+register_format(
+    "tinker",
+    r"(?i)potential energy\s*:?\s*(-?\d+\.\d+)\s*kcal",
+    scale=1.0 / HARTREE_TO_KCAL,
+)
+register_format("plain", r"(?!)")  # * never matches: no energies
+
+
+def get_format(name: str) -> CommentFormat:
+    try:
+        return COMMENT_FORMATS[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown comment format {name!r} ({', '.join(COMMENT_FORMATS)})"
+        ) from None
+
+
+def sniff_format(comment: str) -> CommentFormat:
+    """First registered format whose pattern matches the comment line."""
+    for fmt in COMMENT_FORMATS.values():
+        if fmt.pattern.search(comment):
+            return fmt
+    return COMMENT_FORMATS["plain"]
+
+
+def sniff_file(file_path: str) -> CommentFormat:
+    """Format of the comment line of the first frame of a multi-xyz file."""
+    with open(file_path, "r", encoding="utf-8") as f:
+        f.readline()
+        return sniff_format(f.readline())
+
+
+def parse_energy(comment: str, fmt: CommentFormat) -> float:
+    """Energy (E_h) of one comment line, NaN if it does not fit the format."""
+    if fmt.fast is not None:
+        try:
+            return fmt.fast(comment) * fmt.scale
+        except (ValueError, IndexError):
+            pass
+    match = fmt.pattern.search(comment)
+    if match is None:
+        return np.nan
+    return float(match.group(1)) * fmt.scale
+
+
+def parse_energies(
+    comments: Sequence[str], fmt: CommentFormat
+) -> Tuple[np.ndarray, List[int]]:
+    """
+    Energies (E_h) of all comment lines and the indices of the lines that do
+    not fit the format (NaN). "plain" has no energies and no bad lines.
+    """
+    energies = np.array([parse_energy(line, fmt) for line in comments], dtype=float)
+    if fmt.name == "plain":
+        return energies, []
+    return energies, np.flatnonzero(np.isnan(energies)).tolist()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.0
+
+Vectorised geometric descriptors (collective variables) for trajectories.
+
+Everything works on the whole (n_frames, n_atoms, 3) array at once (NumPy
+broadcasting, no loop over frames):
+    - distances(geoms, [(i, j), ...])             -> (n_frames, n_pairs)
+    - angles(geoms, [(i, j, k), ...])             -> degrees, vertex j
+    - dihedrals(geoms, [(i, j, k, l), ...])       -> degrees in (-180, 180]
+    - evaluate(geoms, "d:3,14-d:3,7")             -> (n_frames,)
+Atom indices are 0-based in the functions, but 1-based in the text specs
+(like the atom numbers of the MATLAB script in analyze_trj_xyz.py and of
+most viewers).
+
+Spec syntax: terms "d:i,j" (distance), "a:i,j,k" (angle), "t:i,j,k,l"
+(torsion/dihedral), joined with + or -, e.g. "d:1,2-d:2,3" for the
+antisymmetric stretch coordinate of a transfer reaction. Anything else can be
+registered as a custom collective variable:
+    register_cv("com_z", lambda geoms: geoms[:, :, 2].mean(axis=1))
+    evaluate(geoms, "com_z")
+(custom names must not contain + or -).
+"""
+
+# * Changelog:
+# * 0.1.0 - Initial release
+
+import re
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+VERSION = "0.1.0"
+
+CV = Callable[[np.ndarray], np.ndarray]  # * (n_frames, n_atoms, 3) -> (n_frames,)
+
+#! custom collective variables, see register_cv
+CUSTOM_CVS: Dict[str, CV] = {}
+
+TERM_PATTERN = re.compile(r"^([dat]):(\d+(?:,\d+)*)$")
+NO_TERM_ATOMS = {"d": 2, "a": 3, "t": 4}
+
+
+def _atoms(geoms: np.ndarray, index: np.ndarray, column: int) -> np.ndarray:
+    """Coordinates of one atom of every tuple: (n_frames, n_tuples, 3)."""
+    return geoms[:, index[:, column], :]
+
+
+def _dot(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.einsum("fpi,fpi->fp", a, b)
+
+
+def _as_index(tuples: Sequence[Sequence[int]], size: int) -> np.ndarray:
+    return np.asarray(tuples, dtype=np.intp).reshape(-1, size)
+
+
+def distances(geoms: np.ndarray, pairs: Sequence[Sequence[int]]) -> np.ndarray:
+    """Distances of atom pairs in every frame (units of geoms)."""
+    index = _as_index(pairs, 2)
+    diff = _atoms(geoms, index, 1) - _atoms(geoms, index, 0)
+    return np.linalg.norm(diff, axis=-1)
+
+
+def angles(geoms: np.ndarray, triples: Sequence[Sequence[int]]) -> np.ndarray:
+    """Angles i-j-k (degrees) in every frame."""
+    index = _as_index(triples, 3)
+    vertex = _atoms(geoms, index, 1)
+    b1 = _atoms(geoms, index, 0) - vertex
+    b2 = _atoms(geoms, index, 2) - vertex
+    cos = _dot(b1, b2) / (np.linalg.norm(b1, axis=-1) * np.linalg.norm(b2, axis=-1))
+    return np.degrees(np.arccos(np.clip(cos, -1.0, 1.0)))
+
+
+def dihedrals(geoms: np.ndarray, quads: Sequence[Sequence[int]]) -> np.ndarray:
+    """Dihedral angles i-j-k-l (degrees, -180 to 180) in every frame."""
+    index = _as_index(quads, 4)
+    p0, p1, p2, p3 = (_atoms(geoms, index, col) for col in range(4))
+    b0 = p0 - p1
+    b1 = p2 - p1
+    b2 = p3 - p2
+    b1 /= np.linalg.norm(b1, axis=-1, keepdims=True)
+    #! projections of b0 and b2 onto the plane perpendicular to the j-k bond
+    v = b0 - _dot(b0, b1)[..., None] * b1
+    w = b2 - _dot(b2, b1)[..., None] * b1
+    x = _dot(v, w)
+    y = _dot(np.cross(b1, v), w)
+    return np.degrees(np.arctan2(y, x))
+
+
+def register_cv(name: str, func: CV) -> None:
+    """Makes a custom collective variable available to evaluate() by name."""
+    CUSTOM_CVS[name] = func
+
+
+def _parse_term(term: str) -> CV:
+    if term in CUSTOM_CVS:
+        return CUSTOM_CVS[term]
+    match = TERM_PATTERN.match(term)
+    if match is None:
+        raise ValueError(f"Unknown coordinate {term!r} (use d:i,j a:i,j,k t:i,j,k,l)")
+    kind = match.group(1)
+    atoms = [int(atom) - 1 for atom in match.group(2).split(",")]  # * 1-based
+    if len(atoms) != NO_TERM_ATOMS[kind] or min(atoms) < 0:
+        raise ValueError(
+            f"{term!r} needs {NO_TERM_ATOMS[kind]} atom numbers (starting at 1)"
+        )
+    func = {"d": distances, "a": angles, "t": dihedrals}[kind]
+    return lambda geoms: func(geoms, [atoms])[:, 0]
+
+
+def parse_cv(spec: str) -> Tuple[Tuple[float, CV], ...]:
+    """Spec -> (sign, function) per term, e.g. "d:1,2-d:2,3"."""
+    spec = spec.replace(" ", "")
+    parts = re.split(r"([+-])", spec)
+    terms = []
+    sign = 1.0
+    for part in parts:
+        if part in ("+", "-"):
+            sign = 1.0 if part == "+" else -1.0
+        elif part:
+            terms.append((sign, _parse_term(part)))
+    if not terms:
+        raise ValueError("Empty coordinate specification")
+    return tuple(terms)
+
+
+def evaluate(geoms: np.ndarray, spec: str) -> np.ndarray:
+    """Value of a collective variable (spec or custom name) in every frame."""
+    geoms = np.asarray(geoms, dtype=float)
+    if geoms.ndim == 2:  # * single geometry
+        geoms = geoms[None]
+    result = np.zeros(len(geoms))
+    for sign, func in parse_cv(spec):
+        result += sign * func(geoms)
+    return result
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.1.2
+
+Kabsch RMSD and conformer clustering for trajectories and CREST ensembles.
+
+The RMSD after optimal superposition is taken directly from the singular
+values of the 3x3 covariance matrix (no rotation matrices are built), which
+makes it cheap to evaluate for many pairs at once:
+    - kabsch_rmsd(a, b)               one pair
+    - rmsd_to_many(ref, geoms)        one geometry against a stack
+    - pairwise_rmsd(geoms)            full matrix, block by block, so the
+                                      scratch memory only depends on block_size
+    - cluster_conformers(geoms, energies, ewin, rmsd_threshold)
+          energy window (kcal/mol) + RMSD threshold (Angstrom) clustering,
+          the lowest conformer of every cluster is kept
+
+Works on the (n_frames, n_atoms, 3) arrays of analyze_trj_xyz.py.
+
+Usage (e.g. before run_censo.py):
+    python3 trj_rmsd.py crest_conformers.xyz --ewin 6 --rmsd 0.125 --heavy
+    -> crest_conformers_pruned.xyz
+"""
+
+# * Changelog:
+# * 0.1.2 - Output written by mol_io.py
+# * 0.1.1 - Energies from the comment line registry (trj_comments.py)
+# * 0.1.0 - Initial release
+
+import argparse
+import os
+import sys
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+VERSION = "0.1.2"
+
+HARTREE_TO_KCAL = 627.509474
+BLOCK_SIZE = 256  # * geometries per block of pairwise_rmsd
+
+
+def center(geoms: np.ndarray) -> np.ndarray:
+    """Moves the centroid of every geometry to the origin."""
+    return geoms - geoms.mean(axis=-2, keepdims=True)
+
+
+def _rmsd_from_cov(
+    cov: np.ndarray, sq_a: np.ndarray, sq_b: np.ndarray, no_atoms: int
+) -> np.ndarray:
+    """
+    RMSD after optimal rotation from the covariance matrices (..., 3, 3) and
+    the sums of squared coordinates of the two (centred) geometries.
+    """
+    sing = np.linalg.svd(cov, compute_uv=False)
+    #! no reflections: the smallest singular value changes sign if det < 0
+    sing[..., 2] *= np.where(np.linalg.det(cov) < 0.0, -1.0, 1.0)
+    msd = (sq_a + sq_b - 2.0 * sing.sum(axis=-1)) / no_atoms
+    return np.sqrt(np.maximum(msd, 0.0))
+
+
+def kabsch_rmsd(a: np.ndarray, b: np.ndarray) -> float:
+    """RMSD of two (n_atoms, 3) geometries after optimal superposition."""
+    return float(rmsd_to_many(a, b[None])[0])
+
+
+def rmsd_to_many(ref: np.ndarray, geoms: np.ndarray) -> np.ndarray:
+    """RMSD of ref (n_atoms, 3) against every geometry of (m, n_atoms, 3)."""
+    ref = center(np.asarray(ref, dtype=float))
+    geoms = center(np.asarray(geoms, dtype=float))
+    cov = np.einsum("nx,mny->mxy", ref, geoms)
+    return _rmsd_from_cov(
+        cov, np.sum(ref**2), np.sum(geoms**2, axis=(1, 2)), ref.shape[0]
+    )
+
+
+def pairwise_rmsd(geoms: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """
+    Full symmetric (n, n) RMSD matrix (float32). Computed in blocks of
+    block_size x block_size pairs, only the upper triangle is evaluated.
+    """
+    geoms = center(np.asarray(geoms, dtype=float))
+    no_geoms, no_atoms = geoms.shape[:2]
+    sq = np.sum(geoms**2, axis=(1, 2))
+    matrix = np.zeros((no_geoms, no_geoms), dtype=np.float32)
+    for start_a in range(0, no_geoms, block_size):
+        block_a = geoms[start_a : start_a + block_size]
+        for start_b in range(start_a, no_geoms, block_size):
+            block_b = geoms[start_b : start_b + block_size]
+            cov = np.einsum("anx,bny->abxy", block_a, block_b)
+            rmsd = _rmsd_from_cov(
+                cov,
+                sq[start_a : start_a + len(block_a), None],
+                sq[None, start_b : start_b + len(block_b)],
+                no_atoms,
+            )
+            matrix[
+                start_a : start_a + len(block_a), start_b : start_b + len(block_b)
+            ] = rmsd
+            matrix[
+                start_b : start_b + len(block_b), start_a : start_a + len(block_a)
+            ] = rmsd.T
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+def cluster_conformers(
+    geoms: np.ndarray,
+    energies: np.ndarray,
+    ewin: float = 6.0,
+    rmsd_threshold: float = 0.125,
+    atoms: Optional[Sequence[int]] = None,
+    block_size: int = BLOCK_SIZE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Energy window + RMSD threshold clustering.
+
+    Conformers more than ewin kcal/mol above the lowest one are dropped. The
+    rest are taken in order of energy: the lowest unassigned conformer starts
+    a new cluster and every unassigned conformer within rmsd_threshold of it
+    joins. atoms restricts the RMSD to some atoms (e.g. heavy atoms only).
+
+    Returns the indices of the cluster representatives (lowest energy first)
+    and the cluster label of every conformer (-1 = outside the window).
+    """
+    energies = np.asarray(energies, dtype=float)
+    geoms = np.asarray(geoms, dtype=float)
+    if atoms is not None:
+        geoms = geoms[:, atoms, :]
+    order = np.argsort(energies, kind="stable")
+    rel = (energies[order] - energies[order[0]]) * HARTREE_TO_KCAL
+    inside = order[rel <= ewin]
+
+    matrix = pairwise_rmsd(geoms[inside], block_size)
+    labels = np.full(len(energies), -1, dtype=int)
+    assigned = np.zeros(len(inside), dtype=bool)
+    representatives = []
+    for pos in range(len(inside)):
+        if assigned[pos]:
+            continue
+        members = ~assigned & (matrix[pos] < rmsd_threshold)
+        members[pos] = True
+        assigned |= members
+        labels[inside[members]] = len(representatives)
+        representatives.append(inside[pos])
+    return np.array(representatives, dtype=int), labels
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="trj_rmsd.py",
+        description="Remove duplicate conformers (energy window + RMSD). "
+        f"Version {VERSION}",
+    )
+    parser.add_argument("ensemble", help="multi-xyz file (crest_conformers.xyz)")
+    parser.add_argument(
+        "--ewin",
+        type=float,
+        default=6.0,
+        help="energy window in kcal/mol (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rmsd",
+        type=float,
+        default=0.125,
+        help="RMSD threshold in Angstrom (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--heavy", action="store_true", help="RMSD of the heavy atoms only"
+    )
+    parser.add_argument("-o", "--output", help="output file (default: *_pruned.xyz)")
+    args = parser.parse_args()
+
+    # * the reader lives in analyze_trj_xyz.py (same directory)
+    from analyze_trj_xyz import Trajectory
+    from mol_io import Ensemble, write
+
+    try:
+        with Trajectory(args.ensemble, use_sidecar=False) as traj:
+            frames = list(traj)
+    except (OSError, ValueError) as err:
+        sys.exit(f"ERROR: {args.ensemble}: {err}")
+    if not frames:
+        sys.exit(f"ERROR: {args.ensemble}: no complete conformer")
+    geoms = np.array([frame.coordinates for frame in frames])
+    energies = np.array([frame.energy for frame in frames])
+    if np.isnan(energies).any():
+        energies = np.nan_to_num(energies, nan=np.inf)
+        print("WARNING: conformers without energy are treated as outside the window")
+    elements = frames[0].elements
+    atoms = [idx for idx, elem in enumerate(elements) if elem.upper() != "H"]
+
+    reps, labels = cluster_conformers(
+        geoms,
+        energies,
+        ewin=args.ewin,
+        rmsd_threshold=args.rmsd,
+        atoms=atoms if args.heavy else None,
+    )
+    output = args.output or os.path.splitext(args.ensemble)[0] + "_pruned.xyz"
+    write(
+        output,
+        Ensemble(elements, geoms[reps], [frames[idx].comment for idx in reps]),
+        fmt="multi-xyz",
+    )
+    print(f"{len(frames)} conformers read")
+    print(f"{np.count_nonzero(labels >= 0)} within {args.ewin} kcal/mol")
+    print(f"{len(reps)} unique (RMSD >= {args.rmsd} A) written to {output}")
+
+
+if __name__ == "__main__":
+    main()
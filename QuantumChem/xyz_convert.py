@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Author: Martin Dagleish (MRJD)
+
+Version 0.4.0
+
+Non-interactive conversion engine for xyz-like coordinate files, shared by
+bohr2aa.py (Bohr -> Angstrom) and tinker_xyz_to_std_xyz.py (Chem3D Tinker ->
+standard xyz).
+
+Every file is handled in bulk:
+    - the structure is read by mol_io.py (xyz, Tinker xyz, bare "El x y z"
+      lines or Turbomole coord, sniffed from the file; "," or "." as decimal
+      separator; the atom lines are parsed with one np.loadtxt call)
+    - atomic numbers are mapped to symbols, dummy atoms (Lp, Xx) are dropped
+      and the unit is scaled as array operations (not for formats that mol_io
+      already returns in Angstrom, e.g. coord)
+    - the new xyz file is written with a single write call
+Many files (or whole directories) are converted in a process pool.
+
+Usage:
+    python3 xyz_convert.py . --scale 0.529177210903 --jobs 4
+    python3 xyz_convert.py a.xyz b.xyz --replace
+
+    from mol_io import BOHR_TO_AA
+    from xyz_convert import convert_file
+    convert_file("mol.xyz", scale=BOHR_TO_AA)
+"""
+
+# * Changelog:
+# * 0.4.0 - Bare coordinate dumps are read again, no scale for coord files
+# * 0.3.1 - --jobs 0 uses the cores available to the process (affinity/cgroup)
+# * 0.3.0 - Atomic numbers are mapped with element_data.py (map_numbers)
+# * 0.2.0 - Reads and writes through mol_io.py
+# * 0.1.0 - Initial release
+
+import argparse
+import fnmatch
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from element_data import MAX_Z, SYMBOLS
+from mol_io import Molecule, guess_format, read_molecule, write
+from orca_out_parser import available_cpus
+
+VERSION = "0.4.0"
+
+DUMMY_ATOMS = ("Lp", "Xx")  # * lone pairs and dummy atoms of Chem3D
+#! mol_io converts these to Angstrom itself, scale is not applied again
+ANGSTROM_FORMATS = ("coord", "orca")
+
+
+def map_symbols(symbols: np.ndarray) -> np.ndarray:
+    """Replaces atomic numbers by symbols (unknown numbers are kept)."""
+    unique, inverse = np.unique(symbols, return_inverse=True)
+    mapped = [
+        SYMBOLS[int(sym)] if sym.isdigit() and 0 < int(sym) <= MAX_Z else sym
+        for sym in unique
+    ]
+    return np.array(mapped, dtype=str)[inverse]
+
+
+def output_name(path: str, suffix: str = "_std") -> str:
+    filename, ext = os.path.splitext(path)
+    return filename + suffix + ext
+
+
+def convert_file(
+    path: str,
+    out_path: Optional[str] = None,
+    scale: float = 1.0,
+    map_numbers: bool = False,
+    drop: Sequence[str] = DUMMY_ATOMS,
+    suffix: str = "_std",
+    replace: bool = False,
+) -> Tuple[str, int]:
+    """
+    Converts one file (default output: <name><suffix>.xyz). An existing output
+    is moved to <output>_old.xyz unless replace is set.
+    Returns the output path and the number of atoms written.
+    """
+    fmt = guess_format(path, multi=False)
+    mol = read_molecule(path, fmt)
+    symbols, coords = mol.symbols, mol.coordinates
+    if fmt in ANGSTROM_FORMATS:
+        scale = 1.0
+    if map_numbers:
+        symbols = map_symbols(symbols)
+    keep = ~np.isin(symbols, drop)
+    symbols = symbols[keep]
+    coords = coords[keep] * scale
+    if not len(symbols):
+        raise ValueError(f"No atom lines found in {path}")
+
+    out_path = out_path or output_name(path, suffix)
+    if not replace and os.path.exists(out_path):
+        os.replace(out_path, output_name(out_path, "_old"))
+    write(out_path, Molecule(symbols, coords, mol.comment), fmt="xyz")
+    return out_path, len(symbols)
+
+
+def find_inputs(
+    directory: str = ".",
+    pattern: str = "*.xyz",
+    skip: Sequence[str] = ("xtbopt", "_std", "_old"),
+) -> List[str]:
+    """Input files of a directory (outputs and xtbopt files are skipped)."""
+    return sorted(
+        os.path.join(directory, entry.name) if directory != "." else entry.name
+        for entry in os.scandir(directory)
+        if entry.is_file()
+        and fnmatch.fnmatch(entry.name, pattern)
+        and not any(part in os.path.splitext(entry.name)[0] for part in skip)
+    )
+
+
+def expand_inputs(paths: Sequence[str], pattern: str = "*.xyz") -> List[str]:
+    """Files as given, directories replaced by their input files."""
+    files: List[str] = []
+    for path in paths:
+        files.extend(find_inputs(path, pattern) if os.path.isdir(path) else [path])
+    return files
+
+
+def _convert_or_error(path: str, **options) -> Tuple[str, str, int, str]:
+    try:
+        out_path, no_atoms = convert_file(path, **options)
+        return path, out_path, no_atoms, ""
+    except (OSError, ValueError) as err:
+        return path, "", 0, str(err)
+
+
+def convert_files(
+    paths: Sequence[str], jobs: int = 1, **options
+) -> Iterator[Tuple[str, str, int, str]]:
+    """
+    convert_file() for many files, in a process pool if jobs > 1 (jobs <= 0:
+    all cores). Yields (input, output, no_atoms, error) in the input order.
+    """
+    if jobs <= 0:
+        jobs = available_cpus()
+    jobs = min(jobs, len(paths))
+    worker = partial(_convert_or_error, **options)
+    if jobs <= 1:
+        yield from map(worker, paths)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(worker, paths, chunksize=4)
+
+
+def build_parser(prog: str, description: str) -> argparse.ArgumentParser:
+    """Command line shared by the converter scripts."""
+    parser = argparse.ArgumentParser(prog=prog, description=description)
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        default=["."],
+        help="files or directories (default: all .xyz files in .)",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="overwrite existing outputs (default: move them to *_old.xyz)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="worker processes (default: all cores)",
+    )
+    return parser
+
+
+def run(paths: Sequence[str], jobs: int = 0, **options) -> int:
+    """Converts and reports like the old interactive scripts, returns #errors."""
+    files = expand_inputs(paths)
+    errors = 0
+    for counter, (path, out_path, no_atoms, error) in enumerate(
+        convert_files(files, jobs, **options), start=1
+    ):
+        if error:
+            errors += 1
+            print(f"\n  ERROR {path}: {error}")
+        else:
+            print(f"\n  Export of {path} as {out_path} finished ({no_atoms} atoms).")
+        print(f"  {counter} / {len(files)} files exported.")
+    print("\n\n*" + 10 * "-" + " EXPORT DONE! " + 10 * "-" + "*")
+    return errors
+
+
+def main() -> None:
+    parser = build_parser(
+        "xyz_convert.py", f"Batch conversion of xyz files. Version {VERSION}"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="factor for all coordinates"
+    )
+    parser.add_argument("--suffix", default="_std", help="suffix of the outputs")
+    args = parser.parse_args()
+    errors = run(
+        args.paths,
+        args.jobs,
+        scale=args.scale,
+        suffix=args.suffix,
+        replace=args.replace,
+    )
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
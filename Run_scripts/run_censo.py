@@ -4,7 +4,7 @@
 """
 Author: Martin Dagleish (MRJD)
 
-Version 0.2.7
+Version 0.2.8
 
 This is a wrapper script for the CENSO programme.
 
@@ -33,6 +33,7 @@ SOFTWARE.
 
 
 # * Changelog
+# * 0.2.8 - Added --prune: remove duplicate conformers (QuantumChem/trj_rmsd.py) first
 # * 0.2.7 - FIXED nuc_bool_dict and args.nucleus
 # * 0.2.6 - Adjusted the restart option to works as described by the author of CENSO.
 # * 0.2.5 - Fixed namespace and restart option
@@ -44,7 +45,7 @@ SOFTWARE.
 # * 0.1.1 - Fixed namespace error
 # * 0.1.0 - Initial release
 
-VERSION = "0.2.7"
+VERSION = "0.2.8"
 
 import os
 import sys
@@ -140,6 +141,22 @@ crest_parser.add_argument(
     help="Restart the calculation from the last saved files.",
 )
 
+crest_parser.add_argument(
+    "--prune",
+    metavar="RMSD",
+    type=float,
+    help="Remove duplicate conformers (heavy atom RMSD below RMSD in Angstrom) \
+        before the CENSO run.",
+)
+
+crest_parser.add_argument(
+    "--ewin",
+    metavar="KCAL",
+    type=float,
+    default=6.0,
+    help="Energy window in kcal/mol for --prune. (default: %(default)s)",
+)
+
 crest_parser.add_argument(
     "-n",
     "--namespace",  #! Optional argument
@@ -236,6 +253,8 @@ if __name__ == "__main__":
 
     user_inp = args.input
     filename, ext = os.path.splitext(user_inp)
+    if args.prune is not None:
+        user_inp = f"{filename}_pruned{ext}"  # * written by trj_rmsd.py
 
     if not args.namespace:
         namespace = filename.split(".")[0]
@@ -247,7 +266,7 @@ if __name__ == "__main__":
 
     # if not args.restart:
     options.append("--input")
-    options.append(args.input)  # * default or custom input file
+    options.append(user_inp)  # * default or custom input file
     options.append("--func0")
     options.append(args.func0)  # * default or custom functional for prescreening
     options.append("--solvent")
@@ -327,6 +346,30 @@ if __name__ == "__main__":
 
     os.chdir(censo_path)
 
+    # * remove duplicate conformers -> fewer CENSO calculations
+    if args.prune is not None:
+        trj_rmsd = os.path.join(
+            os.path.dirname(os.path.realpath(__file__)),
+            os.pardir,
+            "QuantumChem",
+            "trj_rmsd.py",
+        )
+        subprocess.run(
+            [
+                sys.executable,
+                trj_rmsd,
+                args.input,
+                "--ewin",
+                str(args.ewin),
+                "--rmsd",
+                str(args.prune),
+                "--heavy",
+                "--output",
+                user_inp,
+            ],
+            check=True,
+        )
+
     # if not args.restart:
     nuc_bool_dict = {
         "1H": "off",